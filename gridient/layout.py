@@ -1,9 +1,10 @@
+import functools
 import logging
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import xlsxwriter  # Import the main library
-from xlsxwriter.utility import xl_rowcol_to_cell
+from xlsxwriter.utility import xl_col_to_name, xl_rowcol_to_cell
 
 # Use TYPE_CHECKING to avoid circular imports
 if TYPE_CHECKING:
@@ -14,22 +15,65 @@ if TYPE_CHECKING:
 # Ensure these are imported for runtime checks
 from .stacks import ExcelStack
 from .tables import ExcelParameterTable, ExcelTable
-from .values import ExcelFormula, ExcelSeries, ExcelValue
+from .values import ExcelFormula, ExcelSeries, ExcelValue, _row_labels
 
 logger = logging.getLogger(__name__)  # Add logger
 
+# Column letters for a 0-based column index; memoized since a layout reuses the same columns
+_column_name = functools.lru_cache(maxsize=None)(xl_col_to_name)
+
 # Define a type for layout components
 LayoutComponent = Any  # Could be more specific later (ExcelValue, ExcelSeries, etc.)
 
 
-@dataclass
-class PlacedComponent:
+class PlacedComponent(NamedTuple):
+    """A component and its position on a sheet, stored as a plain tuple."""
+
     component: Any  # Could be more specific later (ExcelValue, ExcelSeries, etc.)
     row: int
     col: int
     direction: Optional[str] = "down"  # Default direction for series/tables
 
 
+class _RowOrderedWorksheet:
+    """Worksheet wrapper that buffers cell writes and replays them sorted by (row, col).
+
+    In constant_memory mode xlsxwriter flushes a row as soon as a later row is written,
+    but tables and series write column by column. ``ExcelLayout.write`` calls ``flush``
+    between components, so only rows that later components may still touch stay
+    buffered. Other calls (e.g. set_column) pass straight through to the wrapped worksheet.
+    """
+
+    def __init__(self, worksheet: Any):
+        self._worksheet = worksheet
+        self._cells: List[Tuple[int, int, str, tuple]] = []  # (row, col, method, args)
+
+    def write(self, row: int, col: int, *args: Any) -> None:
+        self._cells.append((row, col, "write", args))
+
+    def write_number(self, row: int, col: int, *args: Any) -> None:
+        self._cells.append((row, col, "write_number", args))
+
+    def write_formula(self, row: int, col: int, *args: Any) -> None:
+        self._cells.append((row, col, "write_formula", args))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._worksheet, name)
+
+    def flush(self, before_row: Optional[int] = None) -> None:
+        """Write the buffered cells above ``before_row`` (all cells if None) in row order.
+
+        The sort is stable, so the last write to a cell wins.
+        """
+        self._cells.sort(key=itemgetter(0, 1))
+        split = len(self._cells)
+        if before_row is not None:
+            split = next((i for i, cell in enumerate(self._cells) if cell[0] >= before_row), split)
+        for row, col, method, args in self._cells[:split]:
+            getattr(self._worksheet, method)(row, col, *args)
+        del self._cells[:split]
+
+
 class ExcelSheetLayout:
     """Manages component layout for a single worksheet."""
 
@@ -48,6 +92,10 @@ class ExcelSheetLayout:
         """Add a component at a specific position with optional direction."""
         self._components.append(PlacedComponent(component, row, col, direction))
 
+    def add_many(self, placements: Iterable[Tuple[Any, ...]]) -> None:
+        """Add several components at once from (component, row, col[, direction]) tuples."""
+        self._components.extend(PlacedComponent(*placement) for placement in placements)
+
     def get_components(self) -> List[PlacedComponent]:
         return self._components
 
@@ -70,100 +118,119 @@ class ExcelLayout:
     def _assign_references_recursive(
         self, component: Any, start_row: int, start_col: int, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]
     ):
-        """Recursively assign Excel references, handling nested stacks and components."""
-        # logger.debug(f"Assigning refs for {type(component)} at ({start_row}, {start_col})") # Optional debug
-        if isinstance(component, ExcelValue):
-            # 1. Assign reference to this ExcelValue if not already mapped
-            if component.id not in ref_map:
-                # --- Handle potential None from xl_rowcol_to_cell ---
-                cell_ref = xl_rowcol_to_cell(start_row, start_col)
-                if cell_ref is None:
-                    # This case is highly unlikely with valid row/col but handles the type possibility
-                    logger.error(
-                        f"xl_rowcol_to_cell returned None for ({start_row}, {start_col})! Cannot assign reference to ExcelValue {component.id}"
-                    )
-                    return  # Skip assignment if ref is None
-                component._excel_ref = cell_ref
-                ref_map[component.id] = (sheet_name, component._excel_ref)  # Store sheet name too
-                # --- End Handle None ---
-
-            # 2. If this ExcelValue contains a formula, process its arguments recursively
-            #    This ensures any nested ExcelValues within the arguments get processed.
-            if isinstance(component._value, ExcelFormula):
-                formula = component._value
-                # logger.debug(f"Processing arguments of formula within ExcelValue {component.id}")
-                for arg in formula.arguments:
-                    # --- FIX: Only process arg if not already mapped --- #
-                    if not (isinstance(arg, ExcelValue) and arg.id in ref_map):
-                        # Pass the *outer* component's location for context, but the recursive call
-                        # should only assign a ref if the arg itself is an unmapped ExcelValue.
-                        self._assign_references_recursive(arg, start_row, start_col, sheet_name, ref_map)
-                    # else:
-                    # logger.debug(f"Skipping already mapped argument {arg.id}")
-
-        elif isinstance(component, ExcelSeries):
-            # This basic version assumes vertical ('down') series placement by default.
-            # Proper handling might need direction info passed down.
-            current_row, current_col = start_row, start_col
-            # logger.debug(f"  Assigning refs for Series '{component.name}' starting at ({current_row}, {current_col})") # Optional debug
-            if component.index is not None:
-                for i, key in enumerate(component.index):
-                    value_obj = component[key]  # Gets the ExcelValue wrapper
-                    # Recursively assign refs for the value object within the series cell
-                    self._assign_references_recursive(value_obj, current_row, current_col, sheet_name, ref_map)
-                    current_row += 1  # Assume vertical layout for now
-            else:
-                logger.warning(f"ExcelSeries '{component.name}' has no index, cannot assign references.")
+        """Recursively assign Excel references, handling nested stacks and components.
 
-        elif isinstance(component, ExcelTable):
-            # Delegate to the table's own reference assignment method
-            if hasattr(component, "_assign_child_references") and callable(component._assign_child_references):
-                # logger.debug(f"  Delegating ref assignment to ExcelTable '{component.title}'") # Optional debug
-                component._assign_child_references(start_row, start_col, sheet_name, self, ref_map)
-            else:
-                logger.error(f"ExcelTable '{component.title}' is missing _assign_child_references method.")
+        Dispatches on ``type(component)`` through ``_REF_HANDLERS`` (one dict lookup per
+        node); subclasses are resolved once by ``_resolve_ref_handler`` and cached.
+        """
+        handler = _REF_HANDLERS.get(type(component)) or _resolve_ref_handler(component)
+        handler(self, component, start_row, start_col, sheet_name, ref_map)
 
-        elif isinstance(component, ExcelParameterTable):
-            # Delegate to the param table's own reference assignment method
-            if hasattr(component, "_assign_child_references") and callable(component._assign_child_references):
-                # logger.debug(f"  Delegating ref assignment to ExcelParameterTable '{component.title}'") # Optional debug
-                component._assign_child_references(start_row, start_col, sheet_name, self, ref_map)
+    def _assign_value_references(
+        self, component: ExcelValue, start_row: int, start_col: int, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]
+    ):
+        # 1. Assign reference to this ExcelValue if not already mapped
+        if component.id not in ref_map:
+            if start_row >= 0 and start_col >= 0:
+                cell_ref = _column_name(start_col) + str(start_row + 1)
             else:
-                logger.error(f"ExcelParameterTable '{component.title}' is missing _assign_child_references method.")
-
-        elif isinstance(component, ExcelStack):
-            # Delegate reference assignment to the stack's method
-            # logger.debug(f"  Delegating ref assignment to ExcelStack '{component.name}'") # Optional debug
-            component._assign_child_references(start_row, start_col, sheet_name, self, ref_map)
-
-        # Check for unhandled types that might contain ExcelValue objects needing references
-        elif isinstance(component, (list, tuple)):  # Example: Handle lists passed directly?
-            logger.warning(f"Directly assigning references for items in a {type(component)}. Behavior might be unexpected.")
-            for item in component:
-                # This assumes items in list don't have their own layout offset - needs refinement
-                self._assign_references_recursive(item, start_row, start_col, sheet_name, ref_map)
-        elif isinstance(component, ExcelFormula):
-            # Formulas themselves don't get cell refs, their container (ExcelValue) does.
-            # We might need to recursively check formula *arguments* if they could be unassigned values.
-            # logger.debug(f"  Skipping direct ref assignment for ExcelFormula: {component}") # Optional debug
-            # Arguments are processed if the formula is wrapped in an ExcelValue (see above),
-            # or if the formula is encountered standalone (e.g., directly in a list).
-            # logger.debug(f"Processing arguments of standalone formula {component}")
-            for arg in component.arguments:
-                # --- FIX: Only process arg if not already mapped --- #
-                if not (isinstance(arg, ExcelValue) and arg.id in ref_map):
-                    self._assign_references_recursive(arg, start_row, start_col, sheet_name, ref_map)
-                # else:
-                # logger.debug(f"Skipping already mapped argument {arg.id}")
-        elif isinstance(component, (int, float, str, bool)) or component is None:
-            # Literals don't need references assigned
-            # logger.debug(f"  Skipping ref assignment for literal: {type(component)}") # Optional debug
-            pass
+                cell_ref = xl_rowcol_to_cell(start_row, start_col)  # Warns and returns "" for negatives
+            component._excel_ref = cell_ref
+            ref_map[component.id] = (sheet_name, component._excel_ref)  # Store sheet name too
+
+        # 2. If this ExcelValue contains a formula, process its arguments recursively
+        #    This ensures any nested ExcelValues within the arguments get processed.
+        if isinstance(component._value, ExcelFormula):
+            # Pass the *outer* component's location for context, but the recursive call
+            # should only assign a ref if the arg itself is an unmapped ExcelValue.
+            self._assign_formula_references(component._value, start_row, start_col, sheet_name, ref_map)
+
+    def _assign_series_references(
+        self, component: ExcelSeries, start_row: int, start_col: int, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]
+    ):
+        # This basic version assumes vertical ('down') series placement by default.
+        # Proper handling might need direction info passed down.
+        if component.index is not None:
+            # Gets the ExcelValue wrappers; assume vertical layout for now
+            values = [component[key] for key in component.index]
+            self._assign_references_batch(values, start_row, start_col, sheet_name, ref_map)
         else:
-            logger.warning(
-                f"Cannot assign references for unhandled component type: {type(component)} at ({start_row},{start_col})"
+            logger.warning(f"ExcelSeries '{component.name}' has no index, cannot assign references.")
+
+    def _assign_container_references(
+        self, component: Any, start_row: int, start_col: int, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]
+    ):
+        # Tables, parameter tables and stacks place their own children
+        assign_child_references = getattr(component, "_assign_child_references", None)
+        if callable(assign_child_references):
+            assign_child_references(start_row, start_col, sheet_name, self, ref_map)
+        else:
+            logger.error(
+                f"{type(component).__name__} '{getattr(component, 'title', None)}' is missing _assign_child_references method."
             )
 
+    def _assign_sequence_references(
+        self, component: Any, start_row: int, start_col: int, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]
+    ):
+        logger.warning(f"Directly assigning references for items in a {type(component)}. Behavior might be unexpected.")
+        for item in component:
+            # This assumes items in list don't have their own layout offset - needs refinement
+            self._assign_references_recursive(item, start_row, start_col, sheet_name, ref_map)
+
+    def _assign_formula_references(
+        self, component: ExcelFormula, start_row: int, start_col: int, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]
+    ):
+        # Formulas themselves don't get cell refs, their container (ExcelValue) does,
+        # but their arguments may be unassigned values.
+        for arg in component.arguments:
+            # --- FIX: Only process arg if not already mapped --- #
+            if not (isinstance(arg, ExcelValue) and arg.id in ref_map):
+                self._assign_references_recursive(arg, start_row, start_col, sheet_name, ref_map)
+
+    def _skip_references(
+        self, component: Any, start_row: int, start_col: int, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]
+    ):
+        # Literals don't need references assigned
+        pass
+
+    def _warn_unhandled_references(
+        self, component: Any, start_row: int, start_col: int, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]
+    ):
+        logger.warning(
+            f"Cannot assign references for unhandled component type: {type(component)} at ({start_row},{start_col})"
+        )
+
+    def _assign_references_batch(
+        self,
+        values: List[Any],
+        start_row: int,
+        col: int,
+        sheet_name: str,
+        ref_map: Dict[int, Tuple[str, str]],
+        row_labels: Optional[List[str]] = None,
+    ):
+        """Assign references to a column of values placed downwards from (start_row, col).
+
+        Plain ExcelValues get their cell reference from a single column-letter lookup
+        instead of one xl_rowcol_to_cell call each; formula arguments and other component
+        types still go through _assign_references_recursive.
+
+        ``row_labels[i]`` is the A1 row number of ``start_row + i``; callers assigning
+        several columns over the same rows can build it once and share it.
+        """
+        col_name = _column_name(col)
+        if row_labels is None or len(row_labels) < len(values):
+            row_labels = _row_labels(start_row, len(values))
+        for offset, value in enumerate(values):
+            row = start_row + offset
+            if isinstance(value, ExcelValue):
+                if value.id not in ref_map:
+                    value._excel_ref = col_name + row_labels[offset]
+                    ref_map[value.id] = (sheet_name, value._excel_ref)
+                if not isinstance(value._value, ExcelFormula):
+                    continue  # Nothing nested to assign
+            self._assign_references_recursive(value, row, col, sheet_name, ref_map)
+
     # --- Modified Original Assign References --- (Calls the recursive helper)
     def _assign_references(self, placed_component: PlacedComponent, sheet_name: str, ref_map: Dict[int, Tuple[str, str]]):
         """Assign references using the recursive helper."""
@@ -173,10 +240,18 @@ class ExcelLayout:
         # This needs refinement, especially for ExcelSeries.
         self._assign_references_recursive(comp, start_row, start_col, sheet_name, ref_map)
 
+    def _layout_pass(self) -> Dict[int, Tuple[str, str]]:
+        """Assign references for every component on every sheet and return the reference map."""
+        ref_map: Dict[int, Tuple[str, str]] = {}  # Map ExcelValue.id -> (sheet_name, cell_ref)
+        for sheet_name, sheet_layout in self._sheets.items():
+            for placed_component in sheet_layout.get_components():
+                # Call the modified _assign_references which uses the recursive helper
+                self._assign_references(placed_component, sheet_name, ref_map)
+        return ref_map
+
     # --- Modified Write Method --- (No major changes needed here for stack logic itself)
     def write(self) -> None:
         """Assign references, write all components to Excel, and close workbook."""
-        ref_map: Dict[int, Tuple[str, str]] = {}  # Map ExcelValue.id -> (sheet_name, cell_ref)
         # Store worksheets and column widths per sheet
         worksheets: Dict[str, xlsxwriter.worksheet.Worksheet] = {}
         sheet_column_widths: Dict[str, Dict[int, float]] = {}
@@ -184,10 +259,7 @@ class ExcelLayout:
         try:
             # --- Layout Pass: Assign references ---
             print("Starting layout pass...")
-            for sheet_name, sheet_layout in self._sheets.items():
-                for placed_component in sheet_layout.get_components():
-                    # Call the modified _assign_references which uses the recursive helper
-                    self._assign_references(placed_component, sheet_name, ref_map)
+            ref_map = self._layout_pass()
             print(f"Layout pass complete. Reference map size: {len(ref_map)}")
 
             # --- Write Pass: Write data and formulas ---
@@ -195,19 +267,27 @@ class ExcelLayout:
             for sheet_name, sheet_layout in self._sheets.items():
                 # Ensure workbook object is available via self.workbook._workbook
                 worksheet = self.workbook._workbook.add_worksheet(sheet_name)  # Use underlying workbook
+                if self.workbook.constant_memory:
+                    # Components write column by column; replay their cells in row order
+                    worksheet = _RowOrderedWorksheet(worksheet)
                 worksheets[sheet_name] = worksheet  # Store worksheet reference
                 sheet_column_widths[sheet_name] = {}  # Initialize width tracker for sheet
                 current_sheet_widths = sheet_column_widths[sheet_name]
 
                 print(f" Writing sheet: {sheet_name}")
-                for placed_component in sheet_layout.get_components():
+                placed_components = sheet_layout.get_components()
+                if isinstance(worksheet, _RowOrderedWorksheet):
+                    # Top to bottom, so rows above the next component can be flushed early
+                    placed_components = sorted(placed_components, key=attrgetter("row"))
+                for index, placed_component in enumerate(placed_components):
                     comp_to_write = placed_component.component
                     row, col = placed_component.row, placed_component.col
 
                     # --- Use the component's write method --- (Handles stacks now)
-                    if hasattr(comp_to_write, "write") and callable(comp_to_write.write):
+                    write = getattr(comp_to_write, "write", None)
+                    if callable(write):
                         # Pass the necessary context for writing, including width tracker
-                        comp_to_write.write(
+                        write(
                             worksheet,
                             row,
                             col,
@@ -221,6 +301,10 @@ class ExcelLayout:
                             f"Component {type(comp_to_write)} at ({row},{col}) on sheet '{sheet_name}' has no write method."
                         )
                         worksheet.write(row, col, f"Unhandled: {type(comp_to_write)}")  # Write placeholder
+                    if isinstance(worksheet, _RowOrderedWorksheet):
+                        # Remaining components start at or below the next one's row; rows above it are final
+                        is_last = index + 1 == len(placed_components)
+                        worksheet.flush(None if is_last else placed_components[index + 1].row)
             print("Write pass complete.")
 
             # --- Auto-Width Pass --- (No changes needed here)
@@ -233,13 +317,58 @@ class ExcelLayout:
                     column_widths = sheet_column_widths.get(sheet_name)
                     if worksheet and column_widths:
                         print(f" Applying auto-width to sheet: {sheet_name}")
-                        for col_idx, width in column_widths.items():
-                            # Apply capping and minimum width
-                            adjusted_width = max(MIN_COL_WIDTH, min(width, MAX_COL_WIDTH))
-                            worksheet.set_column(col_idx, col_idx, adjusted_width)
+                        # Apply capping and minimum width; neighbouring equal widths share one call
+                        adjusted_widths = {
+                            col_idx: max(MIN_COL_WIDTH, min(width, MAX_COL_WIDTH)) for col_idx, width in column_widths.items()
+                        }
+                        for first_col, last_col, width in _column_width_runs(adjusted_widths):
+                            worksheet.set_column(first_col, last_col, width)
             print("Auto-width pass complete.")
 
         finally:
             print("Closing workbook...")
             self.workbook.close()
             print(f"Workbook '{self.workbook.filename}' saved.")
+
+
+def _column_width_runs(column_widths: Dict[int, float]) -> List[Tuple[int, int, float]]:
+    """Fold column index -> width into (first_col, last_col, width) runs of adjacent equal widths."""
+    runs: List[Tuple[int, int, float]] = []
+    for col_idx in sorted(column_widths):
+        width = column_widths[col_idx]
+        if runs and runs[-1][1] == col_idx - 1 and runs[-1][2] == width:
+            runs[-1] = (runs[-1][0], col_idx, width)
+        else:
+            runs.append((col_idx, col_idx, width))
+    return runs
+
+
+# --- Reference assignment dispatch ---
+# isinstance order used to resolve types missing from _REF_HANDLERS (e.g. subclasses)
+_REF_HANDLER_ORDER: Tuple[Tuple[Any, Callable], ...] = (
+    (ExcelValue, ExcelLayout._assign_value_references),
+    (ExcelSeries, ExcelLayout._assign_series_references),
+    ((ExcelTable, ExcelParameterTable, ExcelStack), ExcelLayout._assign_container_references),
+    ((list, tuple), ExcelLayout._assign_sequence_references),
+    (ExcelFormula, ExcelLayout._assign_formula_references),
+    ((int, float, str, bool, type(None)), ExcelLayout._skip_references),
+)
+# Exact type -> handler; subclasses of the types above are added as they are first seen
+_REF_HANDLERS: Dict[type, Callable] = {
+    component_type: handler
+    for types, handler in _REF_HANDLER_ORDER
+    for component_type in (types if isinstance(types, tuple) else (types,))
+}
+
+
+def _resolve_ref_handler(component: Any) -> Callable:
+    """Find the handler for a type missing from _REF_HANDLERS via isinstance.
+
+    Only types with a real handler are cached, so arbitrary unhandled types do not grow
+    the table.
+    """
+    for types, handler in _REF_HANDLER_ORDER:
+        if isinstance(component, types):
+            _REF_HANDLERS[type(component)] = handler
+            return handler
+    return ExcelLayout._warn_unhandled_references
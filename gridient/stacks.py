@@ -31,15 +31,33 @@ class ExcelStack:
 
     # Keep track of calculated size
     _calculated_size: Optional[Tuple[int, int]] = field(default=None, init=False, repr=False)
+    # Stacks this stack is nested in, so a change here also resets their cached sizes
+    _parents: List["ExcelStack"] = field(default_factory=list, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.orientation not in ("vertical", "horizontal"):
             raise ValueError(f"Invalid stack orientation: '{self.orientation}'. Must be 'vertical' or 'horizontal'.")
+        for child in self.children:
+            self._link_child(child)
 
     def add(self, component: LayoutComponent):
         """Add a component (ExcelValue, ExcelTable, ExcelSeries, ExcelStack) to the stack."""
         self.children.append(component)
-        self._calculated_size = None  # Reset size cache
+        self._link_child(component)
+        self._invalidate_size()
+
+    def _link_child(self, child: LayoutComponent) -> None:
+        """Record this stack as a parent of a nested stack."""
+        if isinstance(child, ExcelStack) and not any(parent is self for parent in child._parents):
+            child._parents.append(self)
+
+    def _invalidate_size(self) -> None:
+        """Reset the cached size of this stack and of every stack it is nested in."""
+        self._calculated_size = None
+        for parent in self._parents:
+            # A parent with no cached size has nothing stale above it either
+            if parent._calculated_size is not None:
+                parent._invalidate_size()
 
     def get_size(self) -> Tuple[int, int]:
         """Calculate and return the total size (rows, columns) of the stack including padding."""
@@ -57,8 +75,9 @@ class ExcelStack:
 
         # Recursively get sizes of children
         for child in self.children:
-            if hasattr(child, "get_size") and callable(child.get_size):
-                child_sizes.append(child.get_size())
+            get_size = getattr(child, "get_size", None)  # One attribute lookup per child
+            if callable(get_size):
+                child_sizes.append(get_size())
             else:
                 logger.warning(
                     f"Component {type(child)} in stack '{self.name}' does not have get_size method. Assuming size (1, 1)."
@@ -107,8 +126,9 @@ class ExcelStack:
 
             # Update position for the next child based on orientation and spacing
             child_rows, child_cols = (0, 0)
-            if hasattr(child, "get_size") and callable(child.get_size):
-                child_rows, child_cols = child.get_size()
+            get_size = getattr(child, "get_size", None)
+            if callable(get_size):
+                child_rows, child_cols = get_size()
             else:
                 child_rows, child_cols = (
                     1,
@@ -143,8 +163,9 @@ class ExcelStack:
             logger.debug(f"  Writing child {i} ({type(child)}) at ({child_start_row}, {child_start_col})")
 
             # Use the component's own write method
-            if hasattr(child, "write") and callable(child.write):
-                child.write(
+            write = getattr(child, "write", None)
+            if callable(write):
+                write(
                     worksheet,
                     child_start_row,
                     child_start_col,
@@ -160,8 +181,9 @@ class ExcelStack:
 
             # Update position for the next child
             child_rows, child_cols = (0, 0)
-            if hasattr(child, "get_size") and callable(child.get_size):
-                child_rows, child_cols = child.get_size()
+            get_size = getattr(child, "get_size", None)
+            if callable(get_size):
+                child_rows, child_cols = get_size()
             else:
                 child_rows, child_cols = (
                     1,
@@ -1,10 +1,14 @@
-from dataclasses import dataclass, field
-from typing import Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class ExcelStyle:
-    """Defines visual styling for Excel elements."""
+    """Defines visual styling for Excel elements.
+
+    Styles are immutable: the xlsxwriter properties are computed once on creation and
+    shared by every cell using the style. Use ``dataclasses.replace`` to derive a variant.
+    """
 
     bold: bool = False
     italic: bool = False
@@ -13,26 +17,37 @@ class ExcelStyle:
     # TODO: Add border, alignment, etc. from xlsxwriter format options
 
     # Store corresponding xlsxwriter format object once created
-    _xlsxwriter_format: object = field(default=None, repr=False, init=False)
+    _xlsxwriter_format: object = field(default=None, repr=False, init=False, compare=False)
+    # xlsxwriter format properties, computed once in __post_init__
+    _props: Optional[Dict[str, Any]] = field(default=None, repr=False, init=False, compare=False)
+    # Hash of the compared fields, computed once; styles are used as format cache keys
+    _hash: int = field(default=0, repr=False, init=False, compare=False)
+
+    def __post_init__(self):
+        props: Dict[str, Any] = {}
+        if self.bold:
+            props["bold"] = True
+        if self.italic:
+            props["italic"] = True
+        if self.font_color:
+            props["font_color"] = self.font_color
+        if self.bg_color:
+            props["bg_color"] = self.bg_color
+        # TODO: Add more properties
+        object.__setattr__(self, "_props", props)  # Frozen dataclass; set via object
+        object.__setattr__(self, "_hash", hash(tuple(getattr(self, f.name) for f in fields(self) if f.compare)))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def to_props(self) -> Dict[str, Any]:
+        """Return a copy of the xlsxwriter format properties for this style."""
+        return dict(self._props)
 
     def get_xlsxwriter_format(self, workbook):
         """Get or create the xlsxwriter format object for this style."""
-        if self._xlsxwriter_format is None:
-            format_props = {}
-            if self.bold:
-                format_props["bold"] = True
-            if self.italic:
-                format_props["italic"] = True
-            if self.font_color:
-                format_props["font_color"] = self.font_color
-            if self.bg_color:
-                format_props["bg_color"] = self.bg_color
-            # TODO: Add more properties
-
-            if format_props:  # Only create format if there are properties
-                self._xlsxwriter_format = workbook.add_format(format_props)
-            else:
-                # Use a default or None if no styling is applied
-                # This might need refinement depending on how default styles are handled
-                self._xlsxwriter_format = None
+        if self._xlsxwriter_format is None and self._props:
+            # Only create format if there are properties; otherwise stay None
+            # This might need refinement depending on how default styles are handled
+            object.__setattr__(self, "_xlsxwriter_format", workbook.add_format(self._props))
         return self._xlsxwriter_format
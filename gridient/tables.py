@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 # Import actual classes instead of forward declaring
-from .values import ExcelSeries, ExcelValue
+from .values import ExcelSeries, ExcelValue, _row_labels
 
 # Forward declarations
 # class ExcelValue:
@@ -99,15 +99,16 @@ class ExcelTable:
         data_start_row = current_row
         if not self.columns:
             return
+        # Row numbers are shared by every column, so their strings are built once
+        max_rows = max((len(table_col.series) for table_col in self.columns if table_col.series), default=0)
+        row_labels = _row_labels(data_start_row, max_rows)
         for c_idx, table_col in enumerate(self.columns):
             series = table_col.series
             if not series:
                 continue
-            current_data_col = start_col + c_idx
-            for r_idx, key in enumerate(series.index):
-                value_obj = series[key]
-                current_data_row = data_start_row + r_idx
-                layout_manager._assign_references_recursive(value_obj, current_data_row, current_data_col, sheet_name, ref_map)
+            # Assign the whole column in one call
+            values = [series[key] for key in series.index]
+            layout_manager._assign_references_batch(values, data_start_row, start_col + c_idx, sheet_name, ref_map, row_labels)
 
     def write(
         self,
@@ -218,9 +219,8 @@ class ExcelParameterTable:
             current_row += 1
         current_row += 1
         value_col = start_col + 1
-        for param_value in self.parameters:
-            layout_manager._assign_references_recursive(param_value, current_row, value_col, sheet_name, ref_map)
-            current_row += 1
+        # Parameter values run down a single column, one row each
+        layout_manager._assign_references_batch(self.parameters, current_row, value_col, sheet_name, ref_map)
 
     def write(
         self,
@@ -0,0 +1,65 @@
+"""Helpers for inspecting what a layout would write, without producing an .xlsx file."""
+
+from typing import Any, Dict, Optional
+
+from xlsxwriter.utility import xl_rowcol_to_cell
+
+from .layout import ExcelLayout, ExcelSheetLayout
+from .styling import ExcelStyle
+
+
+class _DictWorksheet:
+    """Worksheet stand-in that stores written cells in a dict keyed by A1 address."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cells: Dict[str, Any] = {}
+
+    def write(self, row: int, col: int, value: Any, cell_format: Any = None) -> None:
+        self.cells[xl_rowcol_to_cell(row, col)] = value
+
+    write_number = write
+
+    def write_formula(self, row: int, col: int, formula: str, cell_format: Any = None) -> None:
+        self.cells[xl_rowcol_to_cell(row, col)] = formula
+
+    def set_column(self, *args: Any) -> None:
+        pass  # Column widths are not recorded
+
+
+class _NoFormatWorkbook:
+    """Workbook stand-in that skips format creation."""
+
+    def get_combined_format(self, style: Optional[ExcelStyle], num_format: Optional[str]) -> None:
+        return None
+
+
+def render_layout(layout: ExcelLayout) -> Dict[str, Dict[str, Any]]:
+    """Run the layout and write passes of ``layout`` into plain dicts.
+
+    Returns ``{sheet_name: {"A1": value_or_formula, ...}}`` with the same values and
+    formula strings ``ExcelLayout.write`` would hand to xlsxwriter. The layout's
+    workbook is not touched, so this works with ``ExcelLayout(None)``.
+    """
+    ref_map = layout._layout_pass()
+    workbook = _NoFormatWorkbook()
+    sheets: Dict[str, Dict[str, Any]] = {}
+    for sheet_name, sheet_layout in layout._sheets.items():
+        worksheet = _DictWorksheet(sheet_name)
+        for placed_component in sheet_layout.get_components():
+            component, row, col = placed_component.component, placed_component.row, placed_component.col
+            write = getattr(component, "write", None)
+            if callable(write):
+                write(worksheet, row, col, workbook, ref_map, {})
+            else:
+                # Same placeholder ExcelLayout.write uses for components without a write method
+                worksheet.write(row, col, f"Unhandled: {type(component)}")
+        sheets[sheet_name] = worksheet.cells
+    return sheets
+
+
+def render_sheet(sheet: ExcelSheetLayout) -> Dict[str, Any]:
+    """Render a single, self-contained sheet layout; see ``render_layout``."""
+    layout = ExcelLayout(None)
+    layout.add_sheet(sheet)
+    return render_layout(layout)[sheet.name]
@@ -1,13 +1,20 @@
+import functools
+import itertools
 import logging
+import re
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-import pandas as pd
 import xlsxwriter.worksheet
-from xlsxwriter.utility import xl_cell_to_rowcol, xl_rowcol_to_cell
+from xlsxwriter.utility import xl_rowcol_to_cell
 
 from .styling import ExcelStyle
 
+if TYPE_CHECKING:
+    # Only needed for annotations; importing pandas would dominate `import gridient`
+    import pandas as pd
+
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
@@ -15,11 +22,68 @@ logger = logging.getLogger(__name__)
 # class ExcelStyle:
 #     pass
 
+_MISSING = object()  # Sentinel for dict lookups where the key may be absent
+
+# Exact literal types written with worksheet.write_number (bool is deliberately absent)
+_NUMBER_TYPES = frozenset((int, float))
+
+
+def _estimate_text_width(text: str) -> float:
+    """Width estimate for a cell's text."""
+    # Basic estimation based on string length, without the formula equals sign
+    if text.startswith("="):
+        text = text[1:]
+    # Basic heuristic: add a little padding
+    return len(text) + 1.5
+
+
+@functools.lru_cache(maxsize=256)
+def _sheet_prefix(sheet_name: str) -> str:
+    """Prefix for a reference into another sheet ("Sheet1!" or "'My Sheet'!"); built once per sheet."""
+    quoted_sheet_name = f"'{sheet_name}'" if " " in sheet_name else sheet_name
+    return quoted_sheet_name + "!"
+
+
+# A1 cell reference, optionally already (partly) absolute: column letters, then a row from 1
+_CELL_REF_RE = re.compile(r"\$?([A-Z]{1,3})\$?([1-9][0-9]*)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _absolute_cell_ref(cell_ref: str) -> str:
+    """Absolute form of an A1 reference ("B3" -> "$B$3"); cached since parameters are referenced from many formulas.
+
+    Anything that is not a single A1 cell reference (ranges, lowercase or non-ASCII
+    columns, row 0) is returned unchanged.
+    """
+    match = _CELL_REF_RE.fullmatch(cell_ref)
+    if match is None:
+        return cell_ref
+    return "$" + match.group(1) + "$" + match.group(2)
+
+
+def _row_labels(start_row: int, count: int) -> List[str]:
+    """A1 row numbers ("1", "2", ...) for ``count`` rows starting at 0-based ``start_row``."""
+    return [str(row) for row in range(start_row + 1, start_row + count + 1)]
+
 
 class ExcelValue:
     """Base class for any value that can be written to Excel."""
 
-    _next_id = 1
+    # Workbooks hold many thousands of values; slots avoid a per-instance __dict__
+    __slots__ = (
+        "_excel_ref",
+        "_parent_series",
+        "_series_key",
+        "_value",
+        "format",
+        "id",
+        "is_parameter",
+        "name",
+        "style",
+        "unit",
+    )
+
+    _id_counter = itertools.count(1)  # Shared source of ids; next() on it is atomic under the GIL
 
     def __init__(
         self,
@@ -42,8 +106,7 @@ class ExcelValue:
             #     logger.debug(f"ExcelValue wrapper inheriting ID {self.id} from inner {type(value)}")
             else:
                 # Assign a new ID to the wrapper ExcelValue
-                self.id = ExcelValue._next_id
-                ExcelValue._next_id += 1
+                self.id = next(ExcelValue._id_counter)
                 logger.debug(f"ExcelValue wrapper assigned new ID {self.id} for inner {type(value)}")
 
             self._value = value
@@ -51,8 +114,7 @@ class ExcelValue:
             # Store the literal value directly, no need to wrap recursively
             # Assign new ID for literals or unknown types
             if _id is None:
-                self.id = ExcelValue._next_id
-                ExcelValue._next_id += 1
+                self.id = next(ExcelValue._id_counter)
             else:
                 # Used when wrapping literals to maintain connection if needed
                 self.id = _id
@@ -175,8 +237,7 @@ class ExcelValue:
             if sheet_name is not None and cell_ref is not None:
                 # Add sheet prefix if necessary
                 if sheet_name != current_sheet_name:
-                    quoted_sheet_name = f"'{sheet_name}'" if " " in sheet_name else sheet_name
-                    full_ref = f"{quoted_sheet_name}!{cell_ref}"
+                    full_ref = _sheet_prefix(sheet_name) + cell_ref
                 else:
                     full_ref = cell_ref
 
@@ -186,12 +247,10 @@ class ExcelValue:
                 # Make the cell reference absolute if it's a parameter
                 if hasattr(inner_value, "is_parameter") and inner_value.is_parameter:
                     try:
-                        row, col = xl_cell_to_rowcol(cell_ref)  # Use non-prefixed ref for conversion
-                        absolute_ref = xl_rowcol_to_cell(row, col, row_abs=True, col_abs=True)
+                        absolute_ref = _absolute_cell_ref(cell_ref)  # Use non-prefixed ref for conversion
                         # Re-add sheet prefix if needed after making absolute
                         if sheet_name != current_sheet_name:
-                            quoted_sheet_name = f"'{sheet_name}'" if " " in sheet_name else sheet_name
-                            absolute_ref = f"{quoted_sheet_name}!{absolute_ref}"
+                            absolute_ref = _sheet_prefix(sheet_name) + absolute_ref
                         formula_str = "=" + absolute_ref
                     except Exception:
                         logger.warning(f"Could not make reference absolute for {cell_ref} (part of {full_ref})")
@@ -223,16 +282,14 @@ class ExcelValue:
     def _estimate_cell_width(self, rendered_value: Any) -> float:
         """Estimate display width of a rendered cell value (simple version)."""
         # TODO: Improve width estimation (consider font, formatting, etc.)
-        # Basic estimation based on string length
+        # Strings (text and formulas) are the common case and need no conversion
+        if type(rendered_value) is str:
+            return _estimate_text_width(rendered_value)
         try:
-            str_val = str(rendered_value)
-            # Remove formula equals sign for width calc
-            if str_val.startswith("="):
-                str_val = str_val[1:]
-            # Basic heuristic: add a little padding
-            return len(str_val) + 1.5
+            text = str(rendered_value)
         except Exception:
             return 5.0  # Default width for unknown types
+        return _estimate_text_width(text)
 
     def write(
         self,
@@ -248,8 +305,6 @@ class ExcelValue:
             # Should be assigned by layout before write is called
             # Assign it now based on row/col for simple cases (might be incorrect for ranges)
             # This needs a proper layout system pass first.
-            from xlsxwriter.utility import xl_rowcol_to_cell
-
             self._excel_ref = xl_rowcol_to_cell(row, col)
             # This write-time assignment won't have sheet context, rely on layout pass
             # If this happens, cross-sheet refs *to* this cell might fail.
@@ -264,7 +319,10 @@ class ExcelValue:
         cell_format = workbook_wrapper.get_combined_format(self.style, self.format)
 
         # Use appropriate worksheet write method
-        if isinstance(value_to_write, str) and value_to_write.startswith("="):
+        if type(value_to_write) in _NUMBER_TYPES:
+            # Typed write skips xlsxwriter's per-call type dispatch for the common case
+            worksheet.write_number(row, col, value_to_write, cell_format)
+        elif isinstance(value_to_write, str) and value_to_write.startswith("="):
             worksheet.write_formula(row, col, value_to_write, cell_format)
         else:
             # TODO: Handle different types more robustly (dates, bools, etc.)
@@ -276,58 +334,42 @@ class ExcelValue:
             column_widths[col] = max(column_widths.get(col, 0), width)
 
     # --- Operator Overloading ---
-    def _create_formula(self, op_name: str, other: Any, reverse: bool = False) -> "ExcelFormula":
-        """Helper to create ExcelFormula object for binary operations."""
-        other_val: Union[ExcelValue, ExcelFormula]
-        if not isinstance(other, (ExcelValue, ExcelFormula)):
-            other_val = ExcelValue(other)
-        else:
-            other_val = other
+    def _binary_op(self, other: Any, symbol: str, reverse: bool = False) -> "ExcelValue":
+        """Wrap ``self <symbol> other`` (or ``other <symbol> self``) in a formula value."""
+        # Wrap literals so every formula argument is an ExcelValue or ExcelFormula
+        other_val = other if isinstance(other, (ExcelValue, ExcelFormula)) else ExcelValue(other)
         args = [other_val, self] if reverse else [self, other_val]
-        return ExcelFormula(op_name, args)
+        return ExcelValue(ExcelFormula(symbol, args))
 
     def __add__(self, other):
-        formula = self._create_formula("+", other)
-        # Automatically assign a basic name based on operands if possible
-        # name = f"({self.name or '?'} + {getattr(other, 'name', '?')})"
-        return ExcelValue(formula)  # Wrap formula in ExcelValue
+        return self._binary_op(other, "+")
 
     def __radd__(self, other):
-        formula = self._create_formula("+", other, reverse=True)
-        # name = f"({getattr(other, 'name', '?')} + {self.name or '?'})"
-        return ExcelValue(formula)
+        return self._binary_op(other, "+", reverse=True)
 
     def __sub__(self, other):
-        formula = self._create_formula("-", other)
-        return ExcelValue(formula)
+        return self._binary_op(other, "-")
 
     def __rsub__(self, other):
-        formula = self._create_formula("-", other, reverse=True)
-        return ExcelValue(formula)
+        return self._binary_op(other, "-", reverse=True)
 
     def __mul__(self, other):
-        formula = self._create_formula("*", other)
-        return ExcelValue(formula)
+        return self._binary_op(other, "*")
 
     def __rmul__(self, other):
-        formula = self._create_formula("*", other, reverse=True)
-        return ExcelValue(formula)
+        return self._binary_op(other, "*", reverse=True)
 
     def __truediv__(self, other):
-        formula = self._create_formula("/", other)
-        return ExcelValue(formula)
+        return self._binary_op(other, "/")
 
     def __rtruediv__(self, other):
-        formula = self._create_formula("/", other, reverse=True)
-        return ExcelValue(formula)
+        return self._binary_op(other, "/", reverse=True)
 
     def __pow__(self, other):
-        formula = self._create_formula("^", other)
-        return ExcelValue(formula)
+        return self._binary_op(other, "^")
 
     def __rpow__(self, other):
-        formula = self._create_formula("^", other, reverse=True)
-        return ExcelValue(formula)
+        return self._binary_op(other, "^", reverse=True)
 
     def __neg__(self):
         # Unary minus should also return a wrapped value
@@ -336,25 +378,25 @@ class ExcelValue:
 
     # --- Comparison Operators ---
     def __eq__(self, other):
-        return ExcelValue(self._create_formula("=", other))
+        return self._binary_op(other, "=")
 
     def __ne__(self, other):
-        return ExcelValue(self._create_formula("<>", other))
+        return self._binary_op(other, "<>")
 
     def __lt__(self, other):
-        return ExcelValue(self._create_formula("<", other))
+        return self._binary_op(other, "<")
 
     def __le__(self, other):
-        return ExcelValue(self._create_formula("<=", other))
+        return self._binary_op(other, "<=")
 
     def __gt__(self, other):
-        return ExcelValue(self._create_formula(">", other))
+        return self._binary_op(other, ">")
 
     def __ge__(self, other):
-        return ExcelValue(self._create_formula(">=", other))
+        return self._binary_op(other, ">=")
 
-    # TODO: Add comparison operators -> ExcelFormula(=, <, >, <=, >=, <>)
-    # TODO: Add unary operators (e.g., __neg__) -> ExcelFormula('-', [self]) ?
+    # == builds a formula rather than comparing, so values are not hashable
+    __hash__ = None  # type: ignore[assignment]
 
     def get_size(self) -> Tuple[int, int]:  # Ensure get_size is present
         """Return the size of a single value: (1 row, 1 column)."""
@@ -365,6 +407,10 @@ class ExcelValue:
         return f"ExcelValue(id={self.id}, name='{self.name}', value={value_repr}, ref='{self._excel_ref or 'Unset'}')"
 
 
+# Operators rendered infix (``=A1+B1``); everything else renders as a function call
+_INFIX_OPERATORS = frozenset({"+", "-", "*", "/", "^", "=", "<>", "<", ">", "<=", ">="})
+
+
 @dataclass
 class ExcelFormula:
     """Represents an Excel formula or function call."""
@@ -389,6 +435,11 @@ class ExcelFormula:
         # Add more operators if needed
     }
 
+    def __post_init__(self):
+        # Share one string object per operator/function name across all formulas
+        if isinstance(self.operator_or_function, str):
+            self.operator_or_function = sys.intern(self.operator_or_function)
+
     def get_precedence(self) -> int:
         """Returns the precedence of the current operator."""
         # High precedence for functions/unknown to avoid unnecessary parentheses
@@ -430,8 +481,7 @@ class ExcelFormula:
             if sheet_name is not None and cell_ref is not None:
                 # Add sheet prefix if necessary
                 if sheet_name != current_sheet_name:
-                    quoted_sheet_name = f"'{sheet_name}'" if " " in sheet_name else sheet_name
-                    full_ref = f"{quoted_sheet_name}!{cell_ref}"
+                    full_ref = _sheet_prefix(sheet_name) + cell_ref
                 else:
                     full_ref = cell_ref
 
@@ -440,12 +490,10 @@ class ExcelFormula:
                 if hasattr(arg, "is_parameter") and arg.is_parameter:
                     try:
                         # Use cell_ref (without sheet) for absolute conversion
-                        row, col = xl_cell_to_rowcol(cell_ref)
-                        rendered_ref = xl_rowcol_to_cell(row, col, row_abs=True, col_abs=True)
+                        rendered_ref = _absolute_cell_ref(cell_ref)
                         # Re-add sheet prefix if needed after making absolute
                         if sheet_name != current_sheet_name:
-                            quoted_sheet_name = f"'{sheet_name}'" if " " in sheet_name else sheet_name
-                            rendered_ref = f"{quoted_sheet_name}!{rendered_ref}"
+                            rendered_ref = _sheet_prefix(sheet_name) + rendered_ref
                     except Exception:
                         # If ref is not a valid cell ref (e.g., range), return as is
                         # logger.warning(f"Could not make reference absolute for {cell_ref} (part of {full_ref})")
@@ -495,19 +543,7 @@ class ExcelFormula:
         rendered_args = [self._render_arg(arg, current_sheet_name, ref_map, current_precedence) for arg in self.arguments]
 
         # Basic infix operators
-        if self.operator_or_function in [
-            "+",
-            "-",
-            "*",
-            "/",
-            "^",
-            "=",
-            "<>",
-            "<",
-            ">",
-            "<=",
-            ">=",
-        ]:
+        if self.operator_or_function in _INFIX_OPERATORS:
             # Handle unary minus
             if self.operator_or_function == "-" and len(rendered_args) == 1:
                 # Check if the argument itself is already negative (e.g., =-(-A1))
@@ -543,6 +579,8 @@ class ExcelFormula:
 class ExcelSeries:
     """Represents a series of Excel values, potentially indexed."""
 
+    __slots__ = ("_data", "format", "index", "name", "style")
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -559,46 +597,51 @@ class ExcelSeries:
 
         if data:
             if isinstance(data, dict):
-                for key, val in data.items():
-                    self[key] = val  # Use __setitem__ to wrap
+                if index is None:
+                    # Keys come straight from the dict, in insertion order
+                    self._bulk_wrap(data.keys(), data.values())
+                else:
+                    for key, val in data.items():
+                        self[key] = val  # Use __setitem__ to wrap
             elif isinstance(data, list):
                 if index is None or len(index) != len(data):
                     # Use default 0-based index if none provided or mismatched
-                    self.index = list(range(len(data)))
+                    self._bulk_wrap(range(len(data)), data)
                 else:
-                    self.index = list(index)  # Ensure it's a list
-
-                for i, val in enumerate(data):
-                    key = self.index[i]
-                    self[key] = val
+                    self._bulk_wrap(index, data)
             else:
                 raise TypeError("Data must be a dict or list")
         elif index is not None:
             # If only index is provided, initialize with empty values
-            self.index = list(index)
-            for key in self.index:
-                self._data[key] = ExcelValue(None, style=self.style, format=self.format)
-                self._data[key]._parent_series = self
-                self._data[key]._series_key = key
+            self._bulk_wrap(index, itertools.repeat(None))
+
+    def _wrap_value(self, key, value) -> ExcelValue:
+        """Wrap a value in a new ExcelValue cell belonging to this series."""
+        excel_val = ExcelValue(value, style=self.style, format=self.format)
+        excel_val._parent_series = self
+        excel_val._series_key = key
+        return excel_val
+
+    def _bulk_wrap(self, keys, values) -> None:
+        """Set the index and wrap all values in a single pass.
+
+        Avoids the per-key index membership scan done by ``__setitem__``.
+        """
+        self.index = list(keys)
+        self._data = {key: self._wrap_value(key, val) for key, val in zip(self.index, values)}
 
     @classmethod
     def from_pandas(
         cls,
-        series: pd.Series,
+        series: "pd.Series",
         name: Optional[str] = None,
         format: Optional[str] = None,
         style: Optional[ExcelStyle] = None,
     ):
         """Create an ExcelSeries from a pandas Series."""
-        new_series = cls(
-            name=name or series.name,
-            format=format,
-            style=style,
-            index=series.index.tolist(),
-        )
-        for key, val in series.items():
-            # Use __setitem__ which handles wrapping values
-            new_series[key] = val
+        new_series = cls(name=name or series.name, format=format, style=style)
+        # Convert index and values once in bulk; tolist() yields Python scalars like items() does
+        new_series._bulk_wrap(series.index.tolist(), series.tolist())
         return new_series
 
     def __len__(self) -> int:
@@ -606,16 +649,15 @@ class ExcelSeries:
 
     def __getitem__(self, key) -> ExcelValue:
         """Get the ExcelValue at a specific key/index."""
-        if key not in self._data:
+        value = self._data.get(key, _MISSING)  # One lookup on the common (hit) path
+        if value is _MISSING:
             # Handle case where key might be in index but not yet in data
             # This can happen if initialized with index only
             if key in self.index:
-                self._data[key] = ExcelValue(None, style=self.style, format=self.format)
-                self._data[key]._parent_series = self
-                self._data[key]._series_key = key
+                value = self._data[key] = self._wrap_value(key, None)
             else:
                 raise KeyError(f"Key {key} not found in ExcelSeries index")
-        return self._data[key]
+        return value
 
     def __setitem__(self, key, value):
         """Set the value at a specific key/index, ensuring a new wrapper is created."""
@@ -625,15 +667,13 @@ class ExcelSeries:
         # --- Always create a new ExcelValue wrapper for the series cell ---
         # This new wrapper holds the assigned 'value' (literal, formula, or another ExcelValue)
         # as its internal _value. Inherit style/format from the series.
-        excel_val = ExcelValue(value, style=self.style, format=self.format)
+        excel_val = self._wrap_value(key, value)
 
         # Optional: Override format/style from assigned ExcelValue if needed
         # if isinstance(value, ExcelValue):
         #     if value.format is not None: excel_val.format = value.format
         #     if value.style is not None: excel_val.style = value.style
 
-        excel_val._parent_series = self
-        excel_val._series_key = key
         self._data[key] = excel_val  # Store the *new wrapper* value
 
     def __iter__(self):
@@ -643,25 +683,24 @@ class ExcelSeries:
 
     def _apply_operation(self, other, op_name: str, reverse: bool = False) -> "ExcelSeries":
         """Apply an operation element-wise."""
-        new_series = ExcelSeries(name=self.name, format=self.format, style=self.style, index=self.index)
-        op_func = getattr(ExcelValue, f"__{op_name}__")
-        rop_func = getattr(ExcelValue, f"__r{op_name}__")
+        new_series = ExcelSeries(name=self.name, format=self.format, style=self.style)
+        op_func, rop_func = _SERIES_ELEMENT_OPERATORS[op_name]
 
         if isinstance(other, ExcelSeries):
             if self.index != other.index:
                 raise ValueError("Cannot perform operation on series with different indexes")
-            for key in self.index:
-                # Perform operation element-wise
-                if reverse:
-                    new_series[key] = rop_func(other[key], self[key])  # other op self
-                else:
-                    new_series[key] = op_func(self[key], other[key])  # self op other
+            # Perform operation element-wise
+            if reverse:
+                results = [rop_func(other[key], self[key]) for key in self.index]  # other op self
+            else:
+                results = [op_func(self[key], other[key]) for key in self.index]  # self op other
         else:  # Operation with a scalar or single ExcelValue
-            for key in self.index:
-                if reverse:
-                    new_series[key] = rop_func(self[key], other)  # other op self[key]
-                else:
-                    new_series[key] = op_func(self[key], other)  # self[key] op other
+            if reverse:
+                results = [rop_func(self[key], other) for key in self.index]  # other op self[key]
+            else:
+                results = [op_func(self[key], other) for key in self.index]  # self[key] op other
+        # Wrap all results in one pass; per-key __setitem__ would rescan the index each time
+        new_series._bulk_wrap(self.index, results)
 
         # Try to generate a name for the new series if the original had one
         if self.name:
@@ -705,3 +744,14 @@ class ExcelSeries:
 
     def __repr__(self) -> str:
         return f"ExcelSeries(name='{self.name}', len={len(self)}, index={self.index[:5]}...)"
+
+
+# --- Element operators for ExcelSeries._apply_operation ---
+# Python operator name -> (ExcelValue operator, reflected ExcelValue operator), resolved once
+_SERIES_ELEMENT_OPERATORS = {
+    "add": (ExcelValue.__add__, ExcelValue.__radd__),
+    "sub": (ExcelValue.__sub__, ExcelValue.__rsub__),
+    "mul": (ExcelValue.__mul__, ExcelValue.__rmul__),
+    "truediv": (ExcelValue.__truediv__, ExcelValue.__rtruediv__),
+    "pow": (ExcelValue.__pow__, ExcelValue.__rpow__),
+}
@@ -1,28 +1,91 @@
-import re
-from typing import Dict, Optional
+import logging
+from typing import IO, Dict, Iterable, Optional, Tuple, Union
 
-import xlsxwriter
+from xlsxwriter import Workbook as _XlsxWorkbook  # Single binding; swap or patch it here
 
 from .styling import ExcelStyle
 
+logger = logging.getLogger(__name__)
+
+_MISSING = object()  # Sentinel for format cache misses (None is a valid cached format)
+
 # Forward declarations
 # class ExcelStyle:
 #     pass
 
 
 class ExcelWorkbook:
-    """Wrapper for xlsxwriter.Workbook with format caching."""
-
-    # Regex pattern for invalid characters in worksheet names
-    _INVALID_CHARS_PATTERN = r"[/\\?*:\[\]]"
-    # Excel's reserved worksheet name
-    _RESERVED_NAMES = ["History"]
-
-    def __init__(self, filename: str):
+    """Wrapper for xlsxwriter.Workbook with format caching.
+
+    ``filename`` may be a path or a binary file-like object such as
+    ``io.BytesIO`` to build the workbook entirely in memory. On slow or network
+    filesystems, a file opened with a larger buffer, e.g.
+    ``open(path, "wb", buffering=1 << 20)``, cuts the number of small writes
+    (the caller closes it after ``close()``). The underlying
+    xlsxwriter.Workbook is only created on first use (adding a worksheet,
+    creating a format or closing).
+
+    ``constant_memory=True`` turns on xlsxwriter's constant_memory mode, which
+    flushes each row to disk once a later row is written. Rows must then be
+    written in order, but tables write column by column, so ``ExcelLayout.write``
+    places a sheet's components top to bottom and buffers their cells until no
+    remaining component can write to those rows. Memory is therefore bounded by
+    the largest band of components sharing rows (a single large table is
+    buffered whole), not flat. Strings are stored inline instead of in the shared
+    strings table, so files can be somewhat larger. ``tmpdir`` sets where
+    xlsxwriter puts its temporary files (default: the system temp directory);
+    if that is a slow disk, a tmpfs such as ``/dev/shm`` keeps the spill in RAM.
+
+    ``in_memory=True`` turns on xlsxwriter's in_memory mode: worksheet data and
+    the zip archive are assembled in RAM and written out once on ``close()``,
+    with no temporary files at all. Use it when the whole workbook comfortably
+    fits in memory; it cannot be combined with ``constant_memory``.
+
+    Formats are created lazily by ``get_combined_format``. When the set of
+    (style, num_format) combinations is known up front, call
+    ``preregister_formats`` before writing so that no formats are created
+    inside the per-cell write loop.
+    """
+
+    # Characters not allowed in worksheet names (frozenset, checked with isdisjoint)
+    _INVALID_CHARS: frozenset = frozenset("/\\?*:[]")
+    # Excel's reserved worksheet names (frozenset for O(1) membership checks)
+    _RESERVED_NAMES: frozenset = frozenset({"History"})
+
+    def __init__(
+        self,
+        filename: Union[str, IO[bytes]],
+        *,
+        constant_memory: bool = False,
+        in_memory: bool = False,
+        tmpdir: Optional[str] = None,
+    ):
+        if constant_memory and in_memory:
+            raise ValueError("constant_memory and in_memory cannot be used together")
         self.filename = filename
-        self._workbook = xlsxwriter.Workbook(filename)
+        self.constant_memory = constant_memory
+        self.in_memory = in_memory
+        self.tmpdir = tmpdir
+        self._xlsx_workbook: Optional[_XlsxWorkbook] = None  # Created lazily, see _workbook
         self._format_cache: Dict[tuple, object] = {}  # Cache for combined formats
 
+    @property
+    def _workbook(self) -> _XlsxWorkbook:
+        """The underlying xlsxwriter.Workbook, created on first access."""
+        if self._xlsx_workbook is None:
+            options = {}
+            if self.constant_memory:
+                options["constant_memory"] = True
+            if self.in_memory:
+                options["in_memory"] = True
+            if self.tmpdir is not None:
+                options["tmpdir"] = self.tmpdir
+            if options:
+                self._xlsx_workbook = _XlsxWorkbook(self.filename, options)
+            else:
+                self._xlsx_workbook = _XlsxWorkbook(self.filename)
+        return self._xlsx_workbook
+
     def validate_worksheet_name(self, name: Optional[str]) -> None:
         r"""
         Validate worksheet name according to Excel rules.
@@ -45,10 +108,10 @@ class ExcelWorkbook:
         if len(name) > 31:
             raise ValueError(f"Worksheet name cannot contain more than 31 characters (got {len(name)})")
 
-        if re.search(self._INVALID_CHARS_PATTERN, name):
+        if not self._INVALID_CHARS.isdisjoint(name):
             raise ValueError(r"Worksheet name contains invalid characters. Cannot use any of: / \ ? * : [ ]")
 
-        if name.startswith("'") or name.endswith("'"):
+        if name[0] == "'" or name[-1] == "'":
             raise ValueError("Worksheet name cannot begin or end with an apostrophe (')")
 
         if name in self._RESERVED_NAMES:
@@ -61,34 +124,34 @@ class ExcelWorkbook:
 
     def get_combined_format(self, style: Optional[ExcelStyle], num_format: Optional[str]):
         """Get or create a cached xlsxwriter format object combining style and number format."""
-        # Create a unique key for the combination
-        style_props = tuple(sorted(style.__dict__.items())) if style else tuple()
-        cache_key = (style_props, num_format)
-
-        if cache_key not in self._format_cache:
-            format_dict = {}
-            if style:
-                # Extract properties from ExcelStyle
-                if style.bold:
-                    format_dict["bold"] = True
-                if style.italic:
-                    format_dict["italic"] = True
-                if style.font_color:
-                    format_dict["font_color"] = style.font_color
-                if style.bg_color:
-                    format_dict["bg_color"] = style.bg_color
-                # TODO: Add other style properties (border, align, etc.)
-
+        # Plain cells (no style, no number format) use the default format
+        if style is None and not num_format:
+            return None
+
+        # Create a unique key for the combination. Styles are frozen and hash by value,
+        # so equal but distinct style objects share one format.
+        cache_key = (style, num_format)
+
+        cell_format = self._format_cache.get(cache_key, _MISSING)
+        if cell_format is _MISSING:
+            # to_props() returns a fresh dict, so the number format can be added in place
+            format_dict = style.to_props() if style else {}
             if num_format:
                 format_dict["num_format"] = num_format
 
             if format_dict:  # Only create format if there are properties
-                self._format_cache[cache_key] = self._workbook.add_format(format_dict)
+                cell_format = self._workbook.add_format(format_dict)
             else:
                 # Use None for default format if no style or num_format applied
-                self._format_cache[cache_key] = None
+                cell_format = None
+            self._format_cache[cache_key] = cell_format
+
+        return cell_format
 
-        return self._format_cache[cache_key]
+    def preregister_formats(self, pairs: Iterable[Tuple[Optional[ExcelStyle], Optional[str]]]) -> None:
+        """Prime the format cache with (style, num_format) pairs ahead of the write loop."""
+        for style, num_format in pairs:
+            self.get_combined_format(style, num_format)
 
     def close(self):
         """Close the workbook file."""
@@ -98,4 +161,12 @@ class ExcelWorkbook:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+        if exc_type is None:
+            self.close()
+            return
+        # An exception is already propagating: still try to flush the file, but never
+        # let a secondary error from close() mask the original exception.
+        try:
+            self.close()
+        except Exception:
+            logger.exception(f"Error while closing workbook '{self.filename}' after {exc_type.__name__}")
@@ -0,0 +1,101 @@
+# Tests can run in parallel with `pytest -n auto --dist loadgroup` (pytest-xdist). Tests must not
+# share disk state: write workbooks to tmp_path or an io.BytesIO, never a fixed file name.
+# Modules whose module-scoped fixtures are expensive (e.g. writing a real .xlsx) set
+# `pytestmark = pytest.mark.xdist_group(...)` so each fixture is built on one worker only.
+import itertools
+
+import pytest
+
+from gridient.values import ExcelValue
+
+
+class Spy:
+    """Minimal stand-in that records every method call made on it.
+
+    Any attribute other than ``name`` is a method that appends ``(method, args, kwargs)``
+    to ``calls`` and returns ``returns.get(method)``. Much cheaper than ``MagicMock``
+    when a worksheet or workbook is exercised in a loop, e.g.
+    ``("write_number", (0, 0, 42, None), {}) in worksheet.calls``.
+    """
+
+    __slots__ = ("calls", "name", "returns")
+
+    def __init__(self, name=None, returns=None):
+        self.name = name
+        self.calls = []  # (method, args, kwargs) per call, in call order
+        self.returns = returns or {}
+
+    def __getattr__(self, method):
+        def record(*args, **kwargs):
+            self.calls.append((method, args, kwargs))
+            return self.returns.get(method)
+
+        return record
+
+
+class FakeXlsxWorkbook:
+    """Stand-in for ``xlsxwriter.Workbook`` that records calls instead of building a file.
+
+    Plain attributes instead of a MagicMock: no child mocks are created on attribute
+    access, and assertions compare ordinary lists.
+    """
+
+    def __init__(self, filename, options=None):
+        self.filename = filename
+        self.options = options
+        self.formats = []  # property dicts passed to add_format, in call order
+        self.worksheet_names = []  # names passed to add_worksheet, in call order
+        self.worksheets = []
+        self.close_calls = 0
+        self.close_error = None  # raised from close() when set
+
+    def add_format(self, properties):
+        self.formats.append(properties)
+        return object()
+
+    def add_worksheet(self, name=None):
+        self.worksheet_names.append(name)
+        worksheet = FakeXlsxWorksheet(name)
+        self.worksheets.append(worksheet)
+        return worksheet
+
+    def close(self):
+        self.close_calls += 1
+        if self.close_error is not None:
+            raise self.close_error
+
+
+class FakeXlsxWorksheet:
+    """Worksheet returned by FakeXlsxWorkbook; accepts and discards every call."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def fake_xlsx(monkeypatch):
+    """Make ExcelWorkbook build FakeXlsxWorkbook instances; returns the list of workbooks created."""
+    created = []
+
+    def factory(*args):
+        workbook = FakeXlsxWorkbook(*args)
+        created.append(workbook)
+        return workbook
+
+    monkeypatch.setattr("gridient.workbook._XlsxWorkbook", factory)
+    return created
+
+
+@pytest.fixture
+def spy_factory():
+    """The Spy class; call it to build call-recording stand-ins, e.g. ``spy_factory(name="Sheet1")``."""
+    return Spy
+
+
+@pytest.fixture
+def reset_ids(monkeypatch):
+    """Number new ExcelValues from 1 during the test, restoring the shared counter afterwards."""
+    monkeypatch.setattr(ExcelValue, "_id_counter", itertools.count(1))
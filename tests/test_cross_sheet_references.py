@@ -1,163 +1,158 @@
-import openpyxl
+import io
+import re
+import zipfile
+from xml.sax.saxutils import unescape
+
+import pytest
+from xlsxwriter.utility import xl_rowcol_to_cell
 
 from gridient import ExcelLayout, ExcelSheetLayout, ExcelValue, ExcelWorkbook
 from gridient.tables import ExcelParameterTable
+from gridient.testing import render_layout
 from gridient.values import ExcelSeries
 
+# The module-scoped layout is written to a real .xlsx; keep its users on one pytest-xdist worker
+pytestmark = pytest.mark.xdist_group("test_cross_sheet_references")
 
-def check_formula_in_xlsx(filename, sheet_name, row, col):
-    """Helper to extract formula from an Excel cell using openpyxl."""
-    wb = openpyxl.load_workbook(filename)
-    ws = wb[sheet_name]
-    cell = ws.cell(row=row + 1, column=col + 1)  # openpyxl uses 1-based indexing
-    return cell.value if cell.value and cell.value.startswith("=") else None
+# Positions (row, col) of the referencing formulas on Sheet2
+VALUE_FORMULA_CELL = (2, 2)
+PARAMETER_FORMULA_CELL = (3, 2)
+PARAMETER_TABLE_FORMULA_CELL = (4, 2)
+SERIES_FORMULA_CELL = (5, 2)
 
 
-def test_cross_sheet_value_reference():
-    """Test if a value reference from one sheet to another includes the sheet name."""
-    # Create a workbook with two sheets
-    filename = "test_cross_sheet_value.xlsx"
-    workbook = ExcelWorkbook(filename)
-    layout = ExcelLayout(workbook)
+def write_workbook_to_bytes(layout):
+    """Helper to write a layout into its in-memory buffer and return the .xlsx bytes."""
+    buffer = layout.workbook.filename
+    layout.write()
+    return buffer.getvalue()
 
-    # Create two sheets
-    sheet1 = ExcelSheetLayout("Sheet1")
-    sheet2 = ExcelSheetLayout("Sheet2")
 
-    # Add value to first sheet
-    value1 = ExcelValue(42, name="Test Value")
-    sheet1.add(value1, 1, 1)
+def read_sheet_xml(xlsx_bytes, sheet_number):
+    """Helper to read one worksheet part from the .xlsx zip."""
+    with zipfile.ZipFile(io.BytesIO(xlsx_bytes)) as archive:
+        return archive.read(f"xl/worksheets/sheet{sheet_number}.xml").decode("utf-8")
 
-    # Create formula referencing the value in second sheet
-    formula = ExcelValue(value1 * 2)  # 2 * value1
-    sheet2.add(formula, 2, 2)
 
-    # Add sheets to layout
-    layout.add_sheet(sheet1)
-    layout.add_sheet(sheet2)
+def check_formula_in_xlsx(xlsx_bytes, sheet_number, row, col):
+    """Helper to extract a formula straight from the worksheet XML inside the .xlsx zip.
 
-    # Write workbook
-    workbook.layout = layout
-    layout.write()
+    Sheets are numbered from 1 in the order they were added to the layout. Only the one
+    worksheet part is read, instead of parsing the whole workbook with openpyxl.
+    """
+    sheet_xml = read_sheet_xml(xlsx_bytes, sheet_number)
+    cell_ref = xl_rowcol_to_cell(row, col)
+    match = re.search(rf'<c r="{cell_ref}"[^>]*><f>([^<]*)</f>', sheet_xml)
+    return "=" + unescape(match.group(1)) if match else None
 
-    # Check if the formula in sheet2 includes a reference to Sheet1
-    formula_text = check_formula_in_xlsx(filename, "Sheet2", 2, 2)
-    assert formula_text is not None
-
-    # Formula should contain Sheet1 reference
-    assert "Sheet1" in formula_text, f"Sheet name not found in formula: {formula_text}"
 
+@pytest.fixture(scope="module")
+def cross_sheet_layout():
+    """Build one layout with every cross-sheet scenario once for the module.
 
-def test_cross_sheet_parameter_reference():
-    """Test if a parameter reference from one sheet to another includes the sheet name."""
-    # Create a workbook with two sheets
-    filename = "test_cross_sheet_parameter.xlsx"
-    workbook = ExcelWorkbook(filename)
+    Sheet1 holds the referenced components, Sheet2 holds one formula per scenario.
+    """
+    workbook = ExcelWorkbook(io.BytesIO())
     layout = ExcelLayout(workbook)
 
     # Create two sheets
     sheet1 = ExcelSheetLayout("Sheet1")
     sheet2 = ExcelSheetLayout("Sheet2")
 
-    # Add parameter to first sheet (using is_parameter=True flag)
-    param1 = ExcelValue(100, name="Test Param", is_parameter=True)
-    sheet1.add(param1, 1, 1)
+    # Plain value
+    value1 = ExcelValue(42, name="Test Value")
+    sheet1.add(value1, 1, 1)
+    sheet2.add(ExcelValue(value1 * 2), *VALUE_FORMULA_CELL)  # 2 * value1
 
-    # Create formula referencing the parameter in second sheet
-    formula = ExcelValue(param1 * 2)  # 2 * param1
-    sheet2.add(formula, 2, 2)
+    # Parameter (using is_parameter=True flag)
+    param = ExcelValue(100, name="Test Param", is_parameter=True)
+    sheet1.add(param, 3, 1)
+    sheet2.add(ExcelValue(param * 2), *PARAMETER_FORMULA_CELL)  # 2 * param
+
+    # Parameter table
+    table = ExcelParameterTable()
+    table_param1 = ExcelValue(10, name="param1", unit="Unit1", is_parameter=True)
+    table_param2 = ExcelValue(20, name="param2", unit="Unit2", is_parameter=True)
+    table.add(table_param1)
+    table.add(table_param2)
+    sheet1.add(table, 5, 1)
+    sheet2.add(ExcelValue(table_param1 * 3), *PARAMETER_TABLE_FORMULA_CELL)  # 3 * param1
+
+    # Series
+    series = ExcelSeries(name="Test Series")
+    series[0] = 100
+    series[1] = 200
+    series[2] = 300
+    sheet1.add(series, 10, 1)
+    element = series[1]  # Value 200
+    sheet2.add(ExcelValue(element * 2), *SERIES_FORMULA_CELL)  # 2 * 200
 
     # Add sheets to layout
     layout.add_sheet(sheet1)
     layout.add_sheet(sheet2)
 
-    # Write workbook
     workbook.layout = layout
-    layout.write()
-
-    # Check if the formula in sheet2 includes a reference to Sheet1
-    formula_text = check_formula_in_xlsx(filename, "Sheet2", 2, 2)
-    assert formula_text is not None
-
-    # Formula should contain Sheet1 reference
-    assert "Sheet1" in formula_text, f"Sheet name not found in formula: {formula_text}"
-
+    return layout
 
-def test_cross_sheet_parameter_table_reference():
-    """Test if a parameter table reference from one sheet to another includes the sheet name."""
-    # Create a workbook with two sheets
-    filename = "test_cross_sheet_table.xlsx"
-    workbook = ExcelWorkbook(filename)
-    layout = ExcelLayout(workbook)
 
-    # Create two sheets
-    sheet1 = ExcelSheetLayout("Sheet1")
-    sheet2 = ExcelSheetLayout("Sheet2")
+@pytest.fixture(scope="module")
+def cross_sheet_cells(cross_sheet_layout):
+    """Cells the layout would write, per sheet and A1 address, without producing an .xlsx."""
+    return render_layout(cross_sheet_layout)
 
-    # Create parameter table in first sheet
-    table = ExcelParameterTable()
-    param1 = ExcelValue(10, name="param1", unit="Unit1", is_parameter=True)
-    param2 = ExcelValue(20, name="param2", unit="Unit2", is_parameter=True)
-    table.add(param1)
-    table.add(param2)
 
-    sheet1.add(table, 1, 1)
+@pytest.fixture(scope="module")
+def cross_sheet_workbook(cross_sheet_layout):
+    """The layout written to an actual .xlsx, for end-to-end coverage."""
+    return write_workbook_to_bytes(cross_sheet_layout)
 
-    # Create formula referencing the parameter in second sheet
-    formula = ExcelValue(param1 * 3)  # 3 * param1
-    sheet2.add(formula, 2, 2)
 
-    # Add sheets to layout
-    layout.add_sheet(sheet1)
-    layout.add_sheet(sheet2)
+def sheet2_formula(cells, row, col):
+    """Helper to look up a rendered formula on Sheet2."""
+    return cells["Sheet2"].get(xl_rowcol_to_cell(row, col))
 
-    # Write workbook
-    workbook.layout = layout
-    layout.write()
 
+def test_cross_sheet_value_reference(cross_sheet_cells):
+    """Test if a value reference from one sheet to another includes the sheet name."""
     # Check if the formula in sheet2 includes a reference to Sheet1
-    formula_text = check_formula_in_xlsx(filename, "Sheet2", 2, 2)
+    formula_text = sheet2_formula(cross_sheet_cells, *VALUE_FORMULA_CELL)
     assert formula_text is not None
 
     # Formula should contain Sheet1 reference
     assert "Sheet1" in formula_text, f"Sheet name not found in formula: {formula_text}"
 
 
-def test_cross_sheet_series_reference():
-    """Test if a series reference from one sheet to another includes the sheet name."""
-    # Create a workbook with two sheets
-    filename = "test_cross_sheet_series.xlsx"
-    workbook = ExcelWorkbook(filename)
-    layout = ExcelLayout(workbook)
+def test_cross_sheet_parameter_reference(cross_sheet_cells):
+    """Test if a parameter reference from one sheet to another includes the sheet name."""
+    # Check if the formula in sheet2 includes a reference to Sheet1
+    formula_text = sheet2_formula(cross_sheet_cells, *PARAMETER_FORMULA_CELL)
+    assert formula_text is not None
 
-    # Create two sheets
-    sheet1 = ExcelSheetLayout("Sheet1")
-    sheet2 = ExcelSheetLayout("Sheet2")
+    # Formula should contain Sheet1 reference
+    assert "Sheet1" in formula_text, f"Sheet name not found in formula: {formula_text}"
 
-    # Create series in first sheet
-    series = ExcelSeries(name="Test Series")
-    series[0] = 100
-    series[1] = 200
-    series[2] = 300
 
-    sheet1.add(series, 1, 1)
+def test_cross_sheet_parameter_table_reference(cross_sheet_cells):
+    """Test if a parameter table reference from one sheet to another includes the sheet name."""
+    # Check if the formula in sheet2 includes a reference to Sheet1
+    formula_text = sheet2_formula(cross_sheet_cells, *PARAMETER_TABLE_FORMULA_CELL)
+    assert formula_text is not None
 
-    # Access element and create formula in second sheet
-    element = series[1]  # Value 200
-    formula = ExcelValue(element * 2)  # 2 * 200
-    sheet2.add(formula, 2, 2)
+    # Formula should contain Sheet1 reference
+    assert "Sheet1" in formula_text, f"Sheet name not found in formula: {formula_text}"
 
-    # Add sheets to layout
-    layout.add_sheet(sheet1)
-    layout.add_sheet(sheet2)
 
-    # Write workbook
-    workbook.layout = layout
-    layout.write()
+def test_cross_sheet_series_reference(cross_sheet_workbook, cross_sheet_cells):
+    """Test if a series reference from one sheet to another includes the sheet name.
 
+    Reads the formula back from the written .xlsx, so the full write path stays covered.
+    """
     # Check if the formula in sheet2 includes a reference to Sheet1
-    formula_text = check_formula_in_xlsx(filename, "Sheet2", 2, 2)
+    formula_text = check_formula_in_xlsx(cross_sheet_workbook, 2, *SERIES_FORMULA_CELL)
     assert formula_text is not None
 
     # Formula should contain Sheet1 reference
     assert "Sheet1" in formula_text, f"Sheet name not found in formula: {formula_text}"
+
+    # The in-memory rendering agrees with what was written
+    assert sheet2_formula(cross_sheet_cells, *SERIES_FORMULA_CELL) == formula_text
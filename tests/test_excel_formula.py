@@ -1,6 +1,19 @@
+import pytest
+
 from gridient.values import ExcelFormula, ExcelValue
 
 
+@pytest.fixture
+def sheet1_cells():
+    """Three parameters placed at A1, B1 and C1 on 'Sheet1', plus their ref_map."""
+    values = [ExcelValue(v, is_parameter=True) for v in (5, 3, 7)]
+    ref_map = {}
+    for value, cell_ref in zip(values, ("A1", "B1", "C1")):
+        value._excel_ref = cell_ref
+        ref_map[value.id] = ("Sheet1", cell_ref)
+    return (*values, ref_map)
+
+
 class TestExcelFormulaCreation:
     """Tests for creating ExcelFormula objects."""
 
@@ -71,88 +84,21 @@ class TestExcelFormulaPrecedence:
 class TestExcelFormulaRendering:
     """Tests for rendering ExcelFormula to Excel formula strings."""
 
-    def test_render_basic_infix_operators(self):
-        """Test rendering basic infix operators."""
-        val1 = ExcelValue(5, is_parameter=True)
-        val2 = ExcelValue(3, is_parameter=True)
-        val1._excel_ref = "A1"
-        val2._excel_ref = "B1"
-
-        # Assume these values are on 'Sheet1' for the test
-        current_sheet = "Sheet1"
-        ref_map = {val1.id: (current_sheet, "A1"), val2.id: (current_sheet, "B1")}
-
-        # Addition
-        formula = ExcelFormula("+", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1+$B$1"
-
-        # Subtraction
-        formula = ExcelFormula("-", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1-$B$1"
-
-        # Multiplication
-        formula = ExcelFormula("*", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1*$B$1"
-
-        # Division
-        formula = ExcelFormula("/", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1/$B$1"
-
-        # Power
-        formula = ExcelFormula("^", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1^$B$1"
-
-    def test_render_comparison_operators(self):
-        """Test rendering comparison operators."""
-        val1 = ExcelValue(5, is_parameter=True)
-        val2 = ExcelValue(3, is_parameter=True)
-        val1._excel_ref = "A1"
-        val2._excel_ref = "B1"
-
-        # Assume these values are on 'Sheet1' for the test
-        current_sheet = "Sheet1"
-        ref_map = {val1.id: (current_sheet, "A1"), val2.id: (current_sheet, "B1")}
-
-        # Equal
-        formula = ExcelFormula("=", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1=$B$1"
-
-        # Not equal
-        formula = ExcelFormula("<>", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1<>$B$1"
-
-        # Greater than
-        formula = ExcelFormula(">", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1>$B$1"
+    @pytest.mark.parametrize(
+        "operator",
+        ["+", "-", "*", "/", "^", "=", "<>", ">", "<", ">=", "<="],
+    )
+    def test_render_binary_operators(self, sheet1_cells, operator):
+        """Test rendering arithmetic and comparison infix operators."""
+        val1, val2, _, ref_map = sheet1_cells
 
-        # Less than
-        formula = ExcelFormula("<", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1<$B$1"
+        formula = ExcelFormula(operator, [val1, val2])
+        assert formula.render("Sheet1", ref_map) == f"=$A$1{operator}$B$1"
 
-        # Greater than or equal
-        formula = ExcelFormula(">=", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1>=$B$1"
-
-        # Less than or equal
-        formula = ExcelFormula("<=", [val1, val2])
-        assert formula.render(current_sheet, ref_map) == "=$A$1<=$B$1"
-
-    def test_render_function_calls(self):
+    def test_render_function_calls(self, sheet1_cells):
         """Test rendering function calls."""
-        val1 = ExcelValue(5, is_parameter=True)
-        val2 = ExcelValue(3, is_parameter=True)
-        val3 = ExcelValue(7, is_parameter=True)
-        val1._excel_ref = "A1"
-        val2._excel_ref = "B1"
-        val3._excel_ref = "C1"
-
-        # Assume these values are on 'Sheet1' for the test
+        val1, val2, val3, ref_map = sheet1_cells
         current_sheet = "Sheet1"
-        ref_map = {
-            val1.id: (current_sheet, "A1"),
-            val2.id: (current_sheet, "B1"),
-            val3.id: (current_sheet, "C1"),
-        }
 
         # SUM function
         formula = ExcelFormula("SUM", [val1, val2, val3])
@@ -213,19 +159,10 @@ class TestExcelFormulaRendering:
 class TestExcelFormulaParenthesesHandling:
     """Tests for parentheses handling in formula rendering."""
 
-    def test_parentheses_for_nested_operators(self):
+    def test_parentheses_for_nested_operators(self, sheet1_cells):
         """Test parentheses are added for nested operators based on precedence."""
-        val1 = ExcelValue(2, is_parameter=True)
-        val2 = ExcelValue(3, is_parameter=True)
-        val3 = ExcelValue(4, is_parameter=True)
-
-        val1._excel_ref = "A1"
-        val2._excel_ref = "B1"
-        val3._excel_ref = "C1"
-
-        # Assume these values are on 'Sheet1' for the test
+        val1, val2, val3, ref_map = sheet1_cells
         current_sheet = "Sheet1"
-        ref_map = {val1.id: (current_sheet, "A1"), val2.id: (current_sheet, "B1"), val3.id: (current_sheet, "C1")}
 
         # Create a formula: (A1 + B1) * C1
         addition = ExcelFormula("+", [val1, val2])
@@ -242,19 +179,10 @@ class TestExcelFormulaParenthesesHandling:
         rendered2 = multiplication2.render(current_sheet, ref_map)
         assert "=$A$1*($B$1+$C$1)" in rendered2
 
-    def test_no_unnecessary_parentheses(self):
+    def test_no_unnecessary_parentheses(self, sheet1_cells):
         """Test that unnecessary parentheses are not added."""
-        val1 = ExcelValue(2, is_parameter=True)
-        val2 = ExcelValue(3, is_parameter=True)
-        val3 = ExcelValue(4, is_parameter=True)
-
-        val1._excel_ref = "A1"
-        val2._excel_ref = "B1"
-        val3._excel_ref = "C1"
-
-        # Assume these values are on 'Sheet1' for the test
+        val1, val2, val3, ref_map = sheet1_cells
         current_sheet = "Sheet1"
-        ref_map = {val1.id: (current_sheet, "A1"), val2.id: (current_sheet, "B1"), val3.id: (current_sheet, "C1")}
 
         # A1 * B1 + C1 (no parentheses needed as * has higher precedence)
         multiplication = ExcelFormula("*", [val1, val2])
@@ -0,0 +1,125 @@
+import io
+
+import pytest
+
+from gridient.layout import ExcelLayout
+from gridient.tables import ExcelParameterTable
+from gridient.values import ExcelValue
+from gridient.workbook import ExcelWorkbook
+
+# --- Shared inputs ---
+
+
+@pytest.fixture
+def param1():
+    return ExcelValue(1, name="Parameter 1", unit="units")
+
+
+@pytest.fixture
+def param2():
+    return ExcelValue(2, name="Parameter 2", unit="m/s")
+
+
+class TestExcelParameterTableCreation:
+    """Tests for creating ExcelParameterTable objects."""
+
+    def test_create_empty_parameter_table(self):
+        """Test creating an empty parameter table."""
+        table = ExcelParameterTable()
+
+        assert table.title is None
+        assert table.parameters == []
+
+        # With title
+        table = ExcelParameterTable(title="Test Parameters")
+        assert table.title == "Test Parameters"
+        assert table.parameters == []
+
+    def test_create_with_parameters(self, param1, param2):
+        """Test creating a parameter table with parameters."""
+        # Create table with parameters
+        table = ExcelParameterTable(title="Test Parameters", parameters=[param1, param2])
+
+        assert table.title == "Test Parameters"
+        assert len(table.parameters) == 2
+        assert table.parameters[0] is param1
+        assert table.parameters[1] is param2
+
+    def test_add_parameter(self, param1, param2):
+        """Test adding parameters after creation."""
+        table = ExcelParameterTable(title="Test Parameters")
+
+        # Add parameters
+        table.add(param1)
+
+        assert len(table.parameters) == 1
+        assert table.parameters[0] is param1
+
+        # Add another parameter
+        table.add(param2)
+
+        assert len(table.parameters) == 2
+        assert table.parameters[1] is param2
+
+        # Test adding invalid type
+        with pytest.raises(TypeError):
+            table.add("not a parameter")
+
+
+class TestExcelParameterTableSizeCalculation:
+    """Tests for ExcelParameterTable size calculation."""
+
+    @pytest.mark.parametrize(
+        "title, parameter_values, expected_size",
+        [
+            # Row for headers only (no title, no parameters); 3 columns (Parameter, Value, Unit)
+            (None, [], (1, 3)),
+            # 1 row for title + 1 row for headers + 0 rows for parameters
+            ("Test Parameters", [], (2, 3)),
+            # 1 row for title + 1 row for headers + 2 rows for parameters
+            ("Test Parameters", [1, 2], (4, 3)),
+        ],
+        ids=["empty", "title_only", "with_parameters"],
+    )
+    def test_parameter_table_size(self, title, parameter_values, expected_size):
+        """Test size calculation for parameter tables with and without title and parameters."""
+        parameters = [ExcelValue(v, name=f"Parameter {i + 1}", unit="units") for i, v in enumerate(parameter_values)]
+        table = ExcelParameterTable(title=title, parameters=parameters)
+        size = table.get_size()
+
+        assert isinstance(size, tuple)
+        assert size == expected_size
+
+    def test_size_follows_changes(self, param1, param2):
+        """Test that get_size reflects parameters and titles changed after it was first called."""
+        parameters = []
+        table = ExcelParameterTable(title="Test Parameters", parameters=parameters)
+        assert table.get_size() == (2, 3)
+
+        table.add(param1)
+        assert table.get_size() == (3, 3)
+
+        # The table keeps the caller's list, so appending to it grows the table too
+        parameters.append(param2)
+        assert table.get_size() == (4, 3)
+
+        table.title = None
+        assert table.get_size() == (3, 3)
+
+
+class TestExcelParameterTableReferences:
+    """Tests for assigning references to parameter table values."""
+
+    def test_values_assigned_down_value_column(self):
+        """Test parameter values get consecutive rows in the Value column."""
+        layout = ExcelLayout(ExcelWorkbook(io.BytesIO()))
+        first = ExcelValue(1, name="First")
+        second = ExcelValue(2, name="Second")
+        table = ExcelParameterTable(title="Inputs", parameters=[first, second])
+        ref_map = {}
+
+        table._assign_child_references(2, 1, "Sheet1", layout, ref_map)
+
+        # Title on row 3, headers on row 4, values in column C below them
+        assert ref_map[first.id] == ("Sheet1", "C5")
+        assert ref_map[second.id] == ("Sheet1", "C6")
@@ -1,4 +1,7 @@
-import pandas as pd
+import operator
+import subprocess
+import sys
+
 import pytest
 
 from gridient.styling import ExcelStyle
@@ -34,7 +37,7 @@ class TestExcelSeriesCreation:
         series = ExcelSeries(data=data)
 
         assert len(series) == 3
-        assert sorted(series.index) == ["a", "b", "c"]
+        assert series.index == ["a", "b", "c"]
 
         # Values should be wrapped in ExcelValue objects
         assert isinstance(series["a"], ExcelValue)
@@ -76,6 +79,7 @@ class TestExcelSeriesCreation:
 
     def test_from_pandas(self):
         """Test creating a series from a pandas Series."""
+        pd = pytest.importorskip("pandas")
         pd_series = pd.Series([1, 2, 3], index=["a", "b", "c"], name="Test Series")
         series = ExcelSeries.from_pandas(pd_series)
 
@@ -164,91 +168,63 @@ class TestExcelSeriesIndexingAndIteration:
             keys.append(key)
             values.append(series[key].value)
 
-        assert sorted(keys) == ["a", "b", "c"]
-        assert sorted(values) == [1, 2, 3]
+        assert keys == ["a", "b", "c"]
+        assert values == [1, 2, 3]
+
+
+# (python operator, rendered Excel operator) pairs shared by the operation tests
+ARITHMETIC_OPERATIONS = [
+    (operator.add, "+"),
+    (operator.sub, "-"),
+    (operator.mul, "*"),
+    (operator.truediv, "/"),
+    (operator.pow, "^"),
+]
+
+
+# Operations build new series and never mutate their operands, so the
+# operand series can be shared by every test in the operations class.
+@pytest.fixture(scope="class")
+def base_series():
+    return ExcelSeries(data={"a": 1, "b": 2, "c": 3})
+
+
+@pytest.fixture(scope="class")
+def other_series():
+    return ExcelSeries(data={"a": 10, "b": 20, "c": 30})
 
 
 class TestExcelSeriesOperations:
     """Tests for arithmetic operations on ExcelSeries."""
 
-    def test_series_scalar_operations(self):
+    @pytest.mark.parametrize("op, symbol", ARITHMETIC_OPERATIONS)
+    def test_series_scalar_operations(self, base_series, op, symbol):
         """Test operations between a series and a scalar."""
-        series = ExcelSeries(data={"a": 1, "b": 2, "c": 3})
-
-        # Addition
-        result = series + 10
+        result = op(base_series, 2)
         assert isinstance(result, ExcelSeries)
 
         # The formula is wrapped in _value (double wrapped due to implementation)
         formula = result["a"].value._value
         assert isinstance(formula, ExcelFormula)
-        assert formula.operator_or_function == "+"
-        assert formula.arguments[0] is series["a"]
-        assert formula.arguments[1].value == 10
-
-        # Subtraction
-        result = series - 5
-        formula = result["a"].value._value
-        assert formula.operator_or_function == "-"
-        assert formula.arguments[1].value == 5
-
-        # Multiplication
-        result = series * 2
-        formula = result["a"].value._value
-        assert formula.operator_or_function == "*"
-        assert formula.arguments[1].value == 2
-
-        # Division
-        result = series / 2
-        formula = result["a"].value._value
-        assert formula.operator_or_function == "/"
+        assert formula.operator_or_function == symbol
+        assert formula.arguments[0] is base_series["a"]
         assert formula.arguments[1].value == 2
 
-        # Power
-        result = series**2
-        formula = result["a"].value._value
-        assert formula.operator_or_function == "^"
-        assert formula.arguments[1].value == 2
-
-    def test_scalar_series_operations(self):
+    @pytest.mark.parametrize("op, symbol", ARITHMETIC_OPERATIONS)
+    def test_scalar_series_operations(self, base_series, op, symbol):
         """Test operations between a scalar and a series (reverse operations)."""
-        series = ExcelSeries(data={"a": 1, "b": 2, "c": 3})
-
-        # Addition
-        result = 10 + series
-        formula = result["a"].value._value
-        assert formula.operator_or_function == "+"
-        assert formula.arguments[0].value == 10
-        assert formula.arguments[1] is series["a"]
-
-        # Subtraction
-        result = 10 - series
-        formula = result["a"].value._value
-        assert formula.operator_or_function == "-"
-        assert formula.arguments[0].value == 10
-
-        # Multiplication
-        result = 2 * series
-        formula = result["a"].value._value
-        assert formula.operator_or_function == "*"
-        assert formula.arguments[0].value == 2
-
-        # Division
-        result = 10 / series
-        formula = result["a"].value._value
-        assert formula.operator_or_function == "/"
-        assert formula.arguments[0].value == 10
+        result = op(2, base_series)
+        assert isinstance(result, ExcelSeries)
 
-        # Power
-        result = 2**series
         formula = result["a"].value._value
-        assert formula.operator_or_function == "^"
+        assert formula.operator_or_function == symbol
         assert formula.arguments[0].value == 2
+        assert formula.arguments[1] is base_series["a"]
 
-    def test_series_series_operations(self):
+    def test_series_series_operations(self, base_series, other_series):
         """Test operations between two series."""
-        series1 = ExcelSeries(data={"a": 1, "b": 2, "c": 3})
-        series2 = ExcelSeries(data={"a": 10, "b": 20, "c": 30})
+        series1 = base_series
+        series2 = other_series
 
         # Addition
         result = series1 + series2
@@ -263,3 +239,12 @@ class TestExcelSeriesOperations:
         # This should raise a ValueError since indexes don't match
         with pytest.raises(ValueError):
             result = series1 + series3
+
+
+class TestImports:
+    """Tests for what importing gridient pulls in."""
+
+    def test_import_does_not_load_pandas(self):
+        """Test that importing gridient leaves pandas unimported until the caller uses it."""
+        code = "import sys, gridient; sys.exit('pandas' in sys.modules)"
+        assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
@@ -0,0 +1,48 @@
+import pytest
+
+from gridient.stacks import ExcelStack
+from gridient.values import ExcelValue
+
+
+class TestExcelStackSize:
+    """Tests for ExcelStack size calculation and its cache."""
+
+    def test_invalid_orientation(self):
+        """Test that an unknown orientation is rejected."""
+        with pytest.raises(ValueError):
+            ExcelStack(orientation="diagonal")
+
+    def test_size_with_spacing_and_padding(self):
+        """Test vertical and horizontal sizes include spacing between children and padding."""
+        vertical = ExcelStack("vertical", children=[ExcelValue(1), ExcelValue(2)], spacing=1, padding=1)
+        horizontal = ExcelStack("horizontal", children=[ExcelValue(1), ExcelValue(2)], spacing=2)
+
+        assert vertical.get_size() == (1 + 1 + 1 + 1, 1 + 1)
+        assert horizontal.get_size() == (1, 1 + 2 + 1)
+
+    def test_size_cached_until_add(self):
+        """Test that get_size is memoized and the cache is reset by add."""
+        stack = ExcelStack("vertical", children=[ExcelValue(1)])
+
+        size = stack.get_size()
+        assert stack.get_size() is size
+
+        stack.add(ExcelValue(2))
+        assert stack.get_size() == (3, 1)
+
+    @pytest.mark.parametrize("nest_via_add", [False, True], ids=["children", "add"])
+    def test_add_to_nested_stack_resets_ancestors(self, nest_via_add):
+        """Test that adding to a nested stack resets the cached sizes of the stacks around it."""
+        inner = ExcelStack("vertical", children=[ExcelValue(1)])
+        if nest_via_add:
+            middle = ExcelStack("horizontal")
+            middle.add(inner)
+        else:
+            middle = ExcelStack("horizontal", children=[inner])
+        outer = ExcelStack("vertical", children=[middle])
+        assert outer.get_size() == (1, 1)
+
+        inner.add(ExcelValue(2))
+
+        assert middle.get_size() == (3, 1)
+        assert outer.get_size() == (3, 1)
@@ -1,9 +1,73 @@
-from unittest.mock import MagicMock
+import time
 
 import pytest
 
-from gridient.tables import ExcelParameterTable, ExcelTable, ExcelTableColumn
-from gridient.values import ExcelSeries, ExcelValue
+from gridient.layout import ExcelLayout
+from gridient.tables import ExcelTable, ExcelTableColumn
+from gridient.values import ExcelSeries
+
+
+class RecordingLayout(ExcelLayout):
+    """Lightweight ExcelLayout stand-in that records reference-assignment calls.
+
+    Subclasses ExcelLayout so the isinstance checks in the code under test pass,
+    but skips the real constructor (no workbook needed). Assigned cells are kept
+    in a set of (id(value), row, col, sheet_name) tuples, so checking for an
+    expected call is a hash lookup rather than a scan over every recorded call.
+    """
+
+    def __init__(self):
+        self.calls = set()
+        self.batch_calls = 0
+        self.ref_maps = []
+
+    def _assign_references_recursive(self, value, row, col, sheet_name, ref_map):
+        self.calls.add((id(value), row, col, sheet_name))
+        self.ref_maps.append(ref_map)
+
+    def _assign_references_batch(self, values, start_row, col, sheet_name, ref_map, row_labels=None):
+        self.batch_calls += 1
+        self.calls.update((id(value), row, col, sheet_name) for row, value in enumerate(values, start_row))
+        self.ref_maps.append(ref_map)
+
+
+class FakeSeries(ExcelSeries):
+    """ExcelSeries with a name and length but no wrapped elements.
+
+    Subclasses ExcelSeries so ExcelTable accepts it as a column. Only the index is
+    filled, so tests that check column counts or sizes skip creating an ExcelValue
+    per element. Elements are still created lazily if a test does index into it.
+    """
+
+    def __init__(self, name, length=3):
+        super().__init__(name=name)
+        self.index = list(range(length))
+
+
+# --- Shared inputs ---
+# Tests that write values (and thereby assign cell references) build their own.
+
+
+@pytest.fixture
+def series_123():
+    return FakeSeries(name="Column 1", length=3)
+
+
+@pytest.fixture
+def series_456():
+    return FakeSeries(name="Column 2", length=3)
+
+
+@pytest.fixture
+def ref_map():
+    """Fresh reference map (ExcelValue.id -> (sheet_name, cell_ref)) for each test."""
+    return {}
+
+
+@pytest.fixture
+def column_widths():
+    """Fresh column width tracker (column index -> width) for each test."""
+    return {}
 
 
 class TestExcelTableCreation:
@@ -21,11 +85,9 @@ class TestExcelTableCreation:
         assert table.title == "Test Table"
         assert table.columns == []
 
-    def test_create_with_columns(self):
+    def test_create_with_columns(self, series_123, series_456):
         """Test creating a table with columns."""
-        # Create columns
-        series1 = ExcelSeries(name="Column 1", data=[1, 2, 3])
-        series2 = ExcelSeries(name="Column 2", data=[4, 5, 6])
+        series1, series2 = series_123, series_456
 
         # Create table with columns directly
         table = ExcelTable(title="Test Table", columns=[series1, series2])
@@ -40,11 +102,9 @@ class TestExcelTableCreation:
         assert table.columns[0].series is series1
         assert table.columns[1].series is series2
 
-    def test_create_with_column_objects(self):
+    def test_create_with_column_objects(self, series_123, series_456):
         """Test creating a table with ExcelTableColumn objects."""
-        # Create columns
-        series1 = ExcelSeries(name="Column 1", data=[1, 2, 3])
-        series2 = ExcelSeries(name="Column 2", data=[4, 5, 6])
+        series1, series2 = series_123, series_456
 
         column1 = ExcelTableColumn(series=series1)
         column2 = ExcelTableColumn(series=series2)
@@ -56,12 +116,12 @@ class TestExcelTableCreation:
         assert table.columns[0] is column1
         assert table.columns[1] is column2
 
-    def test_add_column(self):
+    def test_add_column(self, series_123, series_456):
         """Test adding columns after creation."""
         table = ExcelTable(title="Test Table")
 
         # Add a series as a column
-        series1 = ExcelSeries(name="Column 1", data=[1, 2, 3])
+        series1 = series_123
         table.add_column(series1)
 
         assert len(table.columns) == 1
@@ -69,7 +129,7 @@ class TestExcelTableCreation:
         assert table.columns[0].series is series1
 
         # Add an ExcelTableColumn object
-        series2 = ExcelSeries(name="Column 2", data=[4, 5, 6])
+        series2 = series_456
         column2 = ExcelTableColumn(series=series2)
         table.add_column(column2)
 
@@ -84,55 +144,62 @@ class TestExcelTableCreation:
 class TestExcelTableSizeCalculation:
     """Tests for ExcelTable size calculation."""
 
-    def test_empty_table_size(self):
-        """Test size calculation for an empty table."""
-        table = ExcelTable()
+    @pytest.mark.parametrize(
+        "title, column_lengths, expected_size",
+        [
+            # Empty table: no rows, no columns
+            (None, [], (0, 0)),
+            # Title only: 1 row for title, no columns
+            ("Test Table", [], (1, 0)),
+            # 1 row for title + 1 row for headers + 4 rows for data (max length of columns)
+            ("Test Table", [3, 4], (1 + 1 + 4, 2)),
+            # No title: 1 row for headers + 3 rows for data
+            (None, [3], (1 + 3, 1)),
+        ],
+        ids=["empty", "title_only", "with_columns", "without_title"],
+    )
+    def test_table_size(self, title, column_lengths, expected_size):
+        """Test size calculation for tables with and without title and columns."""
+        columns = [FakeSeries(name=f"Column {i + 1}", length=length) for i, length in enumerate(column_lengths)]
+        table = ExcelTable(title=title, columns=columns)
         size = table.get_size()
 
         assert isinstance(size, tuple)
-        assert len(size) == 2
-        assert size[0] == 0  # No rows
-        assert size[1] == 0  # No columns
+        assert size == expected_size
 
-    def test_table_with_title_only(self):
-        """Test size calculation for a table with title but no columns."""
-        table = ExcelTable(title="Test Table")
-        size = table.get_size()
+    def test_size_follows_add_column(self, series_123, series_456):
+        """Test that get_size reflects columns added after it was first called."""
+        table = ExcelTable(title="Test Table", columns=[series_123])
+        assert table.get_size() == (1 + 1 + 3, 1)
 
-        assert size[0] == 1  # 1 row for title
-        assert size[1] == 0  # No columns
+        table.add_column(series_456)
+        assert table.get_size() == (1 + 1 + 3, 2)
 
-    def test_table_with_columns(self):
-        """Test size calculation for a table with columns."""
-        # Create columns with different lengths
-        series1 = ExcelSeries(name="Column 1", data=[1, 2, 3])
-        series2 = ExcelSeries(name="Column 2", data=[4, 5, 6, 7])
-
-        # Create table
-        table = ExcelTable(title="Test Table", columns=[series1, series2])
+    def test_size_follows_series_growth(self):
+        """Test that get_size reflects rows added to a column's series after it was first called."""
+        series = ExcelSeries(name="Column 1", data=[1, 2, 3])
+        table = ExcelTable(title="Test Table", columns=[series])
+        assert table.get_size() == (1 + 1 + 3, 1)
 
-        size = table.get_size()
+        series["new"] = 4
+        assert table.get_size() == (1 + 1 + 4, 1)
 
-        # 1 row for title + 1 row for headers + 4 rows for data (max length of columns)
-        assert size[0] == 1 + 1 + 4
-        assert size[1] == 2  # 2 columns
+    def test_size_follows_title_change(self, series_123):
+        """Test that get_size reflects setting or clearing the title after it was first called."""
+        table = ExcelTable(columns=[series_123])
+        assert table.get_size() == (1 + 3, 1)
 
-    def test_table_without_title(self):
-        """Test size calculation for a table without title."""
-        series = ExcelSeries(name="Column 1", data=[1, 2, 3])
-        table = ExcelTable(columns=[series])
+        table.title = "Test Table"
+        assert table.get_size() == (1 + 1 + 3, 1)
 
-        size = table.get_size()
-
-        # 1 row for headers + 3 rows for data
-        assert size[0] == 1 + 3
-        assert size[1] == 1  # 1 column
+        table.title = None
+        assert table.get_size() == (1 + 3, 1)
 
 
 class TestExcelTableReferenceAssignment:
     """Tests for ExcelTable reference assignment."""
 
-    def test_assign_child_references(self):
+    def test_assign_child_references(self, ref_map):
         """Test _assign_child_references method."""
         # Create table with columns
         series1 = ExcelSeries(name="Column 1", data=[1, 2])
@@ -140,34 +207,42 @@ class TestExcelTableReferenceAssignment:
 
         table = ExcelTable(title="Test Table", columns=[series1, series2])
 
-        # Create mock layout manager and ref_map
-        # Mock the ExcelLayout type correctly
-        from gridient.layout import ExcelLayout
-
-        layout_manager = MagicMock(spec=ExcelLayout)
-        ref_map = {}
+        # Create recording layout manager (ref_map comes from the fixture)
+        layout_manager = RecordingLayout()
 
         # Call _assign_child_references
         # Assume sheet name is 'Sheet1' for the test
         table._assign_child_references(0, 0, "Sheet1", layout_manager, ref_map)
 
-        # Verify layout_manager._assign_references_recursive was called for each value
-        # Starting row should be 2 (title row + header row)
-        assert layout_manager._assign_references_recursive.call_count == 4  # 2 columns x 2 rows
+        # Verify layout_manager._assign_references_batch was called once per column
+        assert layout_manager.batch_calls == 2  # 2 columns
+        assert all(passed is ref_map for passed in layout_manager.ref_maps)
+
+        # Verify every cell was assigned; starting row should be 2 (title row + header row)
+        assert len(layout_manager.calls) == 4
+        assert (id(series1[0]), 2, 0, "Sheet1") in layout_manager.calls
+        assert (id(series1[1]), 3, 0, "Sheet1") in layout_manager.calls
+        assert (id(series2[0]), 2, 1, "Sheet1") in layout_manager.calls
+        assert (id(series2[1]), 3, 1, "Sheet1") in layout_manager.calls
+
+    def test_assign_child_references_uneven_columns(self):
+        """Test references from a real layout when columns have different lengths."""
+        short = ExcelSeries(name="Short", data=[1])
+        long = ExcelSeries(name="Long", data=[2, 3, 4])
+        table = ExcelTable(columns=[short, long])
+        ref_map = {}
 
-        # Verify calls for first column
-        layout_manager._assign_references_recursive.assert_any_call(series1[0], 2, 0, "Sheet1", ref_map)
-        layout_manager._assign_references_recursive.assert_any_call(series1[1], 3, 0, "Sheet1", ref_map)
+        table._assign_child_references(0, 1, "Sheet1", ExcelLayout(None), ref_map)
 
-        # Verify calls for second column
-        layout_manager._assign_references_recursive.assert_any_call(series2[0], 2, 1, "Sheet1", ref_map)
-        layout_manager._assign_references_recursive.assert_any_call(series2[1], 3, 1, "Sheet1", ref_map)
+        # Header on row 1, data from row 2
+        assert ref_map[short[0].id] == ("Sheet1", "B2")
+        assert [ref_map[long[key].id] for key in long.index] == [("Sheet1", "C2"), ("Sheet1", "C3"), ("Sheet1", "C4")]
 
 
 class TestExcelTableWriting:
     """Tests for ExcelTable writing functionality."""
 
-    def test_write_table(self):
+    def test_write_table(self, ref_map, column_widths):
         """Test write method for ExcelTable."""
         # Create table with columns
         series1 = ExcelSeries(name="Column 1", data=[1, 2])
@@ -175,21 +250,19 @@ class TestExcelTableWriting:
 
         table = ExcelTable(title="Test Table", columns=[series1, series2])
 
-        # Create mocks
-        worksheet = MagicMock()
-        workbook = MagicMock()
-        ref_map = {}
-        column_widths = {}
+        # Create recording stand-ins
+        worksheet = RecordingWorksheet()
+        workbook = NullWorkbook()
 
         # Call write
         table.write(worksheet, 0, 0, workbook, ref_map, column_widths)
 
         # Verify title is written
-        worksheet.write.assert_any_call(0, 0, "Test Table")
+        assert (0, 0, "Test Table") in worksheet.writes
 
         # Verify headers are written
-        worksheet.write.assert_any_call(1, 0, "Column 1")
-        worksheet.write.assert_any_call(1, 1, "Column 2")
+        assert (1, 0, "Column 1") in worksheet.writes
+        assert (1, 1, "Column 2") in worksheet.writes
 
         # Verify data is written through ExcelValue.write
         # We can't easily verify this directly since it's delegated to the ExcelValue objects
@@ -198,89 +271,66 @@ class TestExcelTableWriting:
         assert 1 in column_widths  # Second column
 
 
-class TestExcelParameterTableCreation:
-    """Tests for creating ExcelParameterTable objects."""
+class NullWorksheet:
+    """Worksheet stand-in that discards writes, so timings measure gridient only."""
 
-    def test_create_empty_parameter_table(self):
-        """Test creating an empty parameter table."""
-        table = ExcelParameterTable()
+    name = "Sheet1"
 
-        assert table.title is None
-        assert table.parameters == []
+    def write(self, *args):
+        pass
 
-        # With title
-        table = ExcelParameterTable(title="Test Parameters")
-        assert table.title == "Test Parameters"
-        assert table.parameters == []
+    def write_formula(self, *args):
+        pass
 
-    def test_create_with_parameters(self):
-        """Test creating a parameter table with parameters."""
-        # Create parameters
-        param1 = ExcelValue(1, name="Parameter 1", unit="units")
-        param2 = ExcelValue(2, name="Parameter 2", unit="m/s")
+    def write_number(self, *args):
+        pass
 
-        # Create table with parameters
-        table = ExcelParameterTable(title="Test Parameters", parameters=[param1, param2])
 
-        assert table.title == "Test Parameters"
-        assert len(table.parameters) == 2
-        assert table.parameters[0] is param1
-        assert table.parameters[1] is param2
+class RecordingWorksheet(NullWorksheet):
+    """Worksheet stand-in that keeps (row, col, value) of every plain write in a set."""
 
-    def test_add_parameter(self):
-        """Test adding parameters after creation."""
-        table = ExcelParameterTable(title="Test Parameters")
+    def __init__(self):
+        self.writes = set()
 
-        # Add parameters
-        param1 = ExcelValue(1, name="Parameter 1", unit="units")
-        table.add(param1)
+    def write(self, row, col, value, *args):
+        self.writes.add((row, col, value))
 
-        assert len(table.parameters) == 1
-        assert table.parameters[0] is param1
+    write_number = write
 
-        # Add another parameter
-        param2 = ExcelValue(2, name="Parameter 2", unit="m/s")
-        table.add(param2)
 
-        assert len(table.parameters) == 2
-        assert table.parameters[1] is param2
+class NullWorkbook:
+    """Workbook wrapper stand-in without any formats."""
 
-        # Test adding invalid type
-        with pytest.raises(TypeError):
-            table.add("not a parameter")
+    def get_combined_format(self, style, num_format):
+        return None
 
 
-class TestExcelParameterTableSizeCalculation:
-    """Tests for ExcelParameterTable size calculation."""
+def _time_wide_table_write(n_cols, n_rows=5, repeats=5):
+    """Best-of-N CPU time of writing a laid-out table with n_cols columns.
 
-    def test_empty_parameter_table_size(self):
-        """Test size calculation for an empty parameter table."""
-        table = ExcelParameterTable()
-        size = table.get_size()
+    CPU time rather than wall time, so other pytest-xdist workers sharing the machine
+    do not skew the measurement.
+    """
+    columns = [ExcelSeries(name=f"Column {i}", data=list(range(n_rows))) for i in range(n_cols)]
+    table = ExcelTable(title="Wide Table", columns=columns)
+    ref_map = {}
+    table._assign_child_references(0, 0, "Sheet1", ExcelLayout(None), ref_map)
 
-        assert isinstance(size, tuple)
-        assert len(size) == 2
-        assert size[0] == 1  # Row for headers only (no title, no parameters)
-        assert size[1] == 3  # 3 columns (Parameter, Value, Unit)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.process_time()
+        table.write(NullWorksheet(), 0, 0, NullWorkbook(), ref_map, {})
+        best = min(best, time.process_time() - start)
+    return best
 
-    def test_parameter_table_with_title(self):
-        """Test size calculation for a parameter table with title."""
-        table = ExcelParameterTable(title="Test Parameters")
-        size = table.get_size()
-
-        assert size[0] == 2  # 1 row for title + 1 row for headers + 0 rows for parameters
-        assert size[1] == 3  # 3 columns (Parameter, Value, Unit)
-
-    def test_parameter_table_with_parameters(self):
-        """Test size calculation for a parameter table with parameters."""
-        # Create parameters
-        param1 = ExcelValue(1, name="Parameter 1", unit="units")
-        param2 = ExcelValue(2, name="Parameter 2", unit="m/s")
 
-        # Create table
-        table = ExcelParameterTable(title="Test Parameters", parameters=[param1, param2])
-
-        size = table.get_size()
+@pytest.mark.benchmark
+@pytest.mark.parametrize("n_cols", [500, 1000])
+def test_write_wide_table_scales_linearly(n_cols):
+    """Guard against accidental O(n^2) behaviour in ExcelTable.write for wide tables."""
+    # The baseline is wide enough that timer noise (e.g. under pytest -n auto) stays small
+    baseline = _time_wide_table_write(100)
+    elapsed = _time_wide_table_write(n_cols)
 
-        assert size[0] == 4  # 1 row for title + 1 row for headers + 2 rows for parameters
-        assert size[1] == 3  # 3 columns (Parameter, Value, Unit)
+    # Linear growth would give a ratio of n_cols / 100; allow 2x slack for noise
+    assert elapsed / baseline < (n_cols / 100) * 2
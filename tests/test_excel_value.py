@@ -1,7 +1,11 @@
-from unittest.mock import MagicMock
+import io
+import operator
+
+import pytest
 
 from gridient.styling import ExcelStyle
-from gridient.values import ExcelFormula, ExcelValue
+from gridient.values import ExcelFormula, ExcelSeries, ExcelValue, _absolute_cell_ref
+from gridient.workbook import ExcelWorkbook
 
 
 class TestExcelValueCreation:
@@ -40,23 +44,16 @@ class TestExcelValueCreation:
         assert value.style == style
         assert value.style.bold is True
 
+    @pytest.mark.usefixtures("reset_ids")
     def test_id_assignment(self):
         """Test that IDs are assigned incrementally."""
-        # Reset ID counter for testing
-        original_next_id = ExcelValue._next_id
-        ExcelValue._next_id = 1
-
-        try:
-            val1 = ExcelValue(1)
-            val2 = ExcelValue(2)
-            val3 = ExcelValue(3)
-
-            assert val1.id == 1
-            assert val2.id == 2
-            assert val3.id == 3
-        finally:
-            # Restore original ID counter
-            ExcelValue._next_id = original_next_id
+        val1 = ExcelValue(1)
+        val2 = ExcelValue(2)
+        val3 = ExcelValue(3)
+
+        assert val1.id == 1
+        assert val2.id == 2
+        assert val3.id == 3
 
     def test_wrapped_value_creation(self):
         """Test wrapping an ExcelValue within another ExcelValue."""
@@ -87,101 +84,81 @@ class TestExcelValueReferenceTracking:
     def test_series_parent_relationship(self):
         """Test parent series relationship tracking."""
         value = ExcelValue(42)
-        series_mock = MagicMock()
+        parent = ExcelSeries(name="Parent")
 
         # Initially no parent series
         assert value._parent_series is None
 
         # Set parent series and key
-        value._parent_series = series_mock
+        value._parent_series = parent
         value._series_key = "key1"
 
-        assert value._parent_series is series_mock
+        assert value._parent_series is parent
         assert value._series_key == "key1"
 
 
-class TestExcelValueArithmeticOperations:
-    """Tests for arithmetic operations on ExcelValue objects."""
+ARITHMETIC_OPERATIONS = [
+    (operator.add, "+"),
+    (operator.sub, "-"),
+    (operator.mul, "*"),
+    (operator.truediv, "/"),
+    (operator.pow, "^"),
+]
+
+COMPARISON_OPERATIONS = [
+    (operator.eq, "="),
+    (operator.ne, "<>"),
+    (operator.gt, ">"),
+    (operator.lt, "<"),
+    (operator.ge, ">="),
+    (operator.le, "<="),
+]
 
-    def test_addition(self):
-        """Test addition operator."""
+
+class TestExcelValueOperations:
+    """Tests for arithmetic and comparison operations on ExcelValue objects."""
+
+    @pytest.mark.parametrize("op, symbol", ARITHMETIC_OPERATIONS + COMPARISON_OPERATIONS)
+    def test_binary_operation(self, op, symbol):
+        """Test each binary operator builds the matching formula over both operands."""
         val1 = ExcelValue(5)
         val2 = ExcelValue(3)
 
-        result = val1 + val2
+        result = op(val1, val2)
         assert isinstance(result, ExcelValue)
         assert isinstance(result._value, ExcelFormula)
-        assert result._value.operator_or_function == "+"
+        assert result._value.operator_or_function == symbol
         assert len(result._value.arguments) == 2
         assert result._value.arguments[0] is val1
         assert result._value.arguments[1] is val2
 
         # Test with literal
-        result = val1 + 3
+        result = op(val1, 3)
+        assert result._value.operator_or_function == symbol
         assert isinstance(result._value.arguments[1], ExcelValue)
         assert result._value.arguments[1].value == 3
 
-        # Test reverse addition
-        result = 3 + val1
-        assert result._value.operator_or_function == "+"
-        assert result._value.arguments[0].value == 3
-        assert result._value.arguments[1] is val1
-
-    def test_subtraction(self):
-        """Test subtraction operator."""
+    @pytest.mark.parametrize("op, symbol", ARITHMETIC_OPERATIONS)
+    def test_reverse_operation(self, op, symbol):
+        """Test each arithmetic operator with a literal on the left-hand side."""
         val1 = ExcelValue(5)
-        val2 = ExcelValue(3)
-
-        result = val1 - val2
-        assert result._value.operator_or_function == "-"
-        assert result._value.arguments[0] is val1
-        assert result._value.arguments[1] is val2
 
-        # Test reverse subtraction
-        result = 10 - val1
-        assert result._value.operator_or_function == "-"
-        assert result._value.arguments[0].value == 10
-        assert result._value.arguments[1] is val1
-
-    def test_multiplication(self):
-        """Test multiplication operator."""
-        val1 = ExcelValue(5)
-        val2 = ExcelValue(3)
-
-        result = val1 * val2
-        assert result._value.operator_or_function == "*"
-
-        # Test with literal
-        result = val1 * 3
-        assert result._value.arguments[1].value == 3
-
-        # Test reverse multiplication
-        result = 3 * val1
+        result = op(3, val1)
+        assert result._value.operator_or_function == symbol
         assert result._value.arguments[0].value == 3
+        assert result._value.arguments[1] is val1
 
-    def test_division(self):
-        """Test division operator."""
-        val1 = ExcelValue(10)
-        val2 = ExcelValue(2)
-
-        result = val1 / val2
-        assert result._value.operator_or_function == "/"
-
-        # Test reverse division
-        result = 20 / val1
-        assert result._value.arguments[0].value == 20
-
-    def test_power(self):
-        """Test power operator."""
-        val1 = ExcelValue(2)
-        val2 = ExcelValue(3)
-
-        result = val1**val2
-        assert result._value.operator_or_function == "^"
+    def test_values_stay_unhashable(self):
+        """Test that ExcelValue stays unhashable, since == builds a formula rather than comparing."""
+        with pytest.raises(TypeError):
+            hash(ExcelValue(5))
 
-        # Test reverse power
-        result = 2**val1
-        assert result._value.arguments[0].value == 2
+    def test_values_use_slots(self):
+        """Test that ExcelValue keeps its attributes in slots rather than a per-instance dict."""
+        value = ExcelValue(5)
+        assert not hasattr(value, "__dict__")
+        with pytest.raises(AttributeError):
+            value.unknown_attribute = 1
 
     def test_negation(self):
         """Test unary negation operator."""
@@ -194,52 +171,6 @@ class TestExcelValueArithmeticOperations:
         assert result._value.arguments[0] is val
 
 
-class TestExcelValueComparisonOperations:
-    """Tests for comparison operations on ExcelValue objects."""
-
-    def test_equality(self):
-        """Test equality operator."""
-        val1 = ExcelValue(5)
-        val2 = ExcelValue(5)
-
-        result = val1 == val2
-        assert isinstance(result, ExcelValue)
-        assert result._value.operator_or_function == "="
-
-        # Test with literal
-        result = val1 == 5
-        assert result._value.arguments[1].value == 5
-
-    def test_inequality(self):
-        """Test inequality operator."""
-        val1 = ExcelValue(5)
-        val2 = ExcelValue(3)
-
-        result = val1 != val2
-        assert result._value.operator_or_function == "<>"
-
-    def test_comparison_operators(self):
-        """Test greater than, less than operators."""
-        val1 = ExcelValue(5)
-        val2 = ExcelValue(3)
-
-        # Greater than
-        result = val1 > val2
-        assert result._value.operator_or_function == ">"
-
-        # Less than
-        result = val1 < val2
-        assert result._value.operator_or_function == "<"
-
-        # Greater than or equal
-        result = val1 >= val2
-        assert result._value.operator_or_function == ">="
-
-        # Less than or equal
-        result = val1 <= val2
-        assert result._value.operator_or_function == "<="
-
-
 class TestExcelValueRendering:
     """Tests for ExcelValue rendering functionality."""
 
@@ -296,6 +227,19 @@ class TestExcelValueRendering:
         rendered = value._render_formula_or_value(current_sheet, ref_map)
         assert rendered == "=A1+B1"
 
+    @pytest.mark.parametrize(
+        "cell_ref, expected",
+        [("A1", "$A$1"), ("AB123", "$AB$123"), ("XFD1048576", "$XFD$1048576"), ("$A$1", "$A$1"), ("A$1", "$A$1")],
+    )
+    def test_absolute_cell_ref(self, cell_ref, expected):
+        """Test A1 references are made absolute on both the column and the row, and absolute ones are kept."""
+        assert _absolute_cell_ref(cell_ref) == expected
+
+    @pytest.mark.parametrize("cell_ref", ["A1:B2", "123", "ABC", "a1", "A\u00c41", "A0", "ABCD1"])
+    def test_absolute_cell_ref_keeps_non_cell_refs(self, cell_ref):
+        """Test anything but a plain A1 reference is returned as written."""
+        assert _absolute_cell_ref(cell_ref) == cell_ref
+
     def test_cell_width_estimation(self):
         """Test cell width estimation for different values."""
         val_int = ExcelValue(42)
@@ -309,29 +253,35 @@ class TestExcelValueRendering:
         # Formula width (strips = sign)
         assert val_formula._estimate_cell_width("=A1+B1") == len("A1+B1") + 1.5
 
+    def test_cell_width_estimation_unstringable_value(self):
+        """Test values whose str() fails fall back to the default width."""
+
+        class Unstringable:
+            def __str__(self):
+                raise RuntimeError("no text form")
+
+        assert ExcelValue(1)._estimate_cell_width(Unstringable()) == 5.0
+
 
 class TestExcelValueWriting:
     """Tests for ExcelValue writing functionality."""
 
-    def test_write_literal_value(self):
+    def test_write_literal_value(self, spy_factory):
         """Test writing literal values to Excel."""
-        workbook_mock = MagicMock()
-        worksheet_mock = MagicMock()
+        workbook_spy = spy_factory()  # get_combined_format returns None (no format)
+        worksheet_spy = spy_factory(name="Sheet1")
         value = ExcelValue(42)
 
-        # Mock get_combined_format to return None (no format)
-        workbook_mock.get_combined_format.return_value = None
-
         # Call write
-        value.write(worksheet_mock, 0, 0, workbook_mock, {})
+        value.write(worksheet_spy, 0, 0, workbook_spy, {})
 
-        # Verify worksheet.write was called with correct args
-        worksheet_mock.write.assert_called_once_with(0, 0, 42, None)
+        # Numbers go through the typed worksheet.write_number
+        assert worksheet_spy.calls == [("write_number", (0, 0, 42, None), {})]
 
-    def test_write_formula(self):
+    def test_write_formula(self, spy_factory):
         """Test writing formula values to Excel."""
-        workbook_mock = MagicMock()
-        worksheet_mock = MagicMock()
+        workbook_spy = spy_factory()
+        worksheet_spy = spy_factory(name="Sheet1")
 
         # Create a formula with known cell references
         val1 = ExcelValue(5)
@@ -344,31 +294,26 @@ class TestExcelValueWriting:
         # Set up ref_map
         # Assume Sheet1 context for ref_map and write
         current_sheet = "Sheet1"
-        worksheet_mock.name = current_sheet  # Set sheet name on mock
         ref_map = {val1.id: (current_sheet, "A1"), val2.id: (current_sheet, "B1")}
 
         # Call write
-        formula.write(worksheet_mock, 0, 0, workbook_mock, ref_map)
+        formula.write(worksheet_spy, 0, 0, workbook_spy, ref_map)
 
-        # Formula should be written using write_formula
-        worksheet_mock.write_formula.assert_called_once()
-        # Check first argument (row, col, formula)
-        assert worksheet_mock.write_formula.call_args[0][0] == 0
-        assert worksheet_mock.write_formula.call_args[0][1] == 0
+        # Formula should be written using write_formula at (0, 0)
         # The fix in _render_arg handles simple refs correctly now
-        assert worksheet_mock.write_formula.call_args[0][2] == "=A1+B1"
+        assert worksheet_spy.calls == [("write_formula", (0, 0, "=A1+B1", None), {})]
 
-    def test_track_column_width(self):
+    def test_track_column_width(self, spy_factory):
         """Test column width tracking during write."""
-        workbook_mock = MagicMock()
-        worksheet_mock = MagicMock()
+        workbook_spy = spy_factory()
+        worksheet_spy = spy_factory(name="Sheet1")
         value = ExcelValue("test width")
 
         # Initialize column widths dictionary
         column_widths = {}
 
         # Call write with column_widths tracker
-        value.write(worksheet_mock, 0, 0, workbook_mock, {}, column_widths)
+        value.write(worksheet_spy, 0, 0, workbook_spy, {}, column_widths)
 
         # Verify column width was updated
         assert 0 in column_widths
@@ -376,30 +321,43 @@ class TestExcelValueWriting:
 
         # Test with a wider value in same column
         wider_value = ExcelValue("this is a much wider test value")
-        wider_value.write(worksheet_mock, 1, 0, workbook_mock, {}, column_widths)
+        wider_value.write(worksheet_spy, 1, 0, workbook_spy, {}, column_widths)
 
         # Width should be updated to wider value
         assert column_widths[0] > len("test width")
 
-    def test_write_with_style(self):
+    def test_write_with_style(self, spy_factory):
         """Test writing with style and format applied."""
-        workbook_mock = MagicMock()
-        worksheet_mock = MagicMock()
-
         # Create style and format
         style = ExcelStyle(bold=True)
         value = ExcelValue(42, format="#,##0.00", style=style)
 
-        # Mock format object
-        format_mock = MagicMock()
-        workbook_mock.get_combined_format.return_value = format_mock
-
-        worksheet_mock.name = "Sheet1"  # Set sheet name for write call
+        # Stand-in format object returned by the workbook
+        cell_format = object()
+        workbook_spy = spy_factory(returns={"get_combined_format": cell_format})
+        worksheet_spy = spy_factory(name="Sheet1")
 
         # Call write
-        value.write(worksheet_mock, 0, 0, workbook_mock, {})
+        value.write(worksheet_spy, 0, 0, workbook_spy, {})
 
         # Verify style was requested and applied
-        workbook_mock.get_combined_format.assert_called_once_with(style, "#,##0.00")
+        assert workbook_spy.calls == [("get_combined_format", (style, "#,##0.00"), {})]
         # The value should be written as the number 42, not string '42'
-        worksheet_mock.write.assert_called_once_with(0, 0, 42, format_mock)
+        assert worksheet_spy.calls == [("write_number", (0, 0, 42, cell_format), {})]
+
+    def test_write_reuses_combined_format(self, spy_factory):
+        """Test that cells sharing a style and number format get the same format object."""
+        workbook = ExcelWorkbook(io.BytesIO())
+        builtin_formats = len(workbook._workbook.formats)
+        worksheet_spy = spy_factory(name="Sheet1")
+
+        style = ExcelStyle(bold=True)
+        ExcelValue(1, format="#,##0.00", style=style).write(worksheet_spy, 0, 0, workbook, {})
+        # An equal but distinct style maps to the same format
+        ExcelValue(2, format="#,##0.00", style=ExcelStyle(bold=True)).write(worksheet_spy, 1, 0, workbook, {})
+
+        (_, first_args, _), (_, second_args, _) = worksheet_spy.calls
+        assert first_args[3] is not None
+        assert second_args[3] is first_args[3]
+        # Only one xlsxwriter format was created for both cells
+        assert len(workbook._workbook.formats) == builtin_formats + 1
@@ -1,155 +1,192 @@
-import os
-import tempfile
-from unittest.mock import MagicMock, patch
+import dataclasses
+import io
+import zipfile
 
-from gridient.layout import ExcelLayout, ExcelSheetLayout
+import pytest
+
+from gridient.layout import _REF_HANDLERS, ExcelLayout, ExcelSheetLayout, _column_width_runs, _RowOrderedWorksheet
 from gridient.styling import ExcelStyle
 from gridient.tables import ExcelParameterTable, ExcelTable
+from gridient.testing import render_sheet
 from gridient.values import ExcelSeries, ExcelValue
 from gridient.workbook import ExcelWorkbook
 
 
+class StubComponent:
+    """Plain stand-in for a placeable component; cheaper than a MagicMock."""
+
+    def get_size(self):
+        return (2, 3)  # 2 rows, 3 columns
+
+
 class TestExcelWorkbook:
     """Tests for ExcelWorkbook class."""
 
-    def test_workbook_creation(self):
+    def test_workbook_creation(self, fake_xlsx):
         """Test creating an ExcelWorkbook."""
-        # Use mock to avoid actual file creation during tests
-        with patch("xlsxwriter.Workbook") as mock_workbook:
-            # Configure the mock
-            mock_workbook_instance = MagicMock()
-            mock_workbook.return_value = mock_workbook_instance
+        # Create the workbook
+        workbook = ExcelWorkbook("test.xlsx")
 
-            # Create the workbook
-            workbook = ExcelWorkbook("test.xlsx")
+        # Check initialization
+        assert workbook.filename == "test.xlsx"
+        assert workbook._workbook is fake_xlsx[0]
+        assert isinstance(workbook._format_cache, dict)
+        assert len(workbook._format_cache) == 0
 
-            # Check initialization
-            assert workbook.filename == "test.xlsx"
-            assert workbook._workbook is mock_workbook_instance
-            assert isinstance(workbook._format_cache, dict)
-            assert len(workbook._format_cache) == 0
+        # Verify the xlsxwriter workbook was created once, without options
+        assert len(fake_xlsx) == 1
+        assert fake_xlsx[0].filename == "test.xlsx"
+        assert fake_xlsx[0].options is None
 
-            # Verify xlsxwriter.Workbook was called
-            mock_workbook.assert_called_once_with("test.xlsx")
+    def test_workbook_created_on_first_use(self, fake_xlsx):
+        """Test that the xlsxwriter workbook is not created until it is needed."""
+        workbook = ExcelWorkbook("test.xlsx")
+        assert fake_xlsx == []
 
-    def test_add_worksheet(self):
-        """Test adding a worksheet to the workbook."""
-        with patch("xlsxwriter.Workbook") as mock_workbook:
-            # Configure the mock
-            mock_workbook_instance = MagicMock()
-            mock_worksheet = MagicMock()
-            mock_workbook_instance.add_worksheet.return_value = mock_worksheet
-            mock_workbook.return_value = mock_workbook_instance
+        workbook.add_worksheet("Sheet1")
+        workbook.add_worksheet("Sheet2")
 
-            # Create the workbook and add a worksheet
-            workbook = ExcelWorkbook("test.xlsx")
-            worksheet = workbook.add_worksheet("Sheet1")
+        # Created once, on the first worksheet
+        assert len(fake_xlsx) == 1
+        assert fake_xlsx[0].worksheet_names == ["Sheet1", "Sheet2"]
 
-            # Verify add_worksheet was called
-            mock_workbook_instance.add_worksheet.assert_called_once_with("Sheet1")
+    def test_workbook_options(self, fake_xlsx, tmp_path):
+        """Test constant_memory and tmpdir are passed through to xlsxwriter."""
+        workbook = ExcelWorkbook("test.xlsx", constant_memory=True, tmpdir=str(tmp_path))
+        workbook.add_worksheet("Sheet1")
 
-            # Verify the returned worksheet
-            assert worksheet is mock_worksheet
+        assert fake_xlsx[0].options == {"constant_memory": True, "tmpdir": str(tmp_path)}
 
-    def test_get_combined_format(self):
-        """Test the format caching mechanism."""
-        with patch("xlsxwriter.Workbook") as mock_workbook:
-            # Configure the mock
-            mock_workbook_instance = MagicMock()
-            mock_format = MagicMock()
-            mock_workbook_instance.add_format.return_value = mock_format
-            mock_workbook.return_value = mock_workbook_instance
+    def test_in_memory_option(self, fake_xlsx):
+        """Test in_memory is passed through to xlsxwriter and rejected together with constant_memory."""
+        ExcelWorkbook("test.xlsx", in_memory=True).add_worksheet("Sheet1")
+        assert fake_xlsx[0].options == {"in_memory": True}
 
-            # Create the workbook
-            workbook = ExcelWorkbook("test.xlsx")
+        with pytest.raises(ValueError, match="cannot be used together"):
+            ExcelWorkbook("test.xlsx", constant_memory=True, in_memory=True)
 
-            # Test with no style or format (should return None)
-            format1 = workbook.get_combined_format(None, None)
-            assert format1 is None
+    def test_add_worksheet(self, fake_xlsx):
+        """Test adding a worksheet to the workbook."""
+        # Create the workbook and add a worksheet
+        workbook = ExcelWorkbook("test.xlsx")
+        worksheet = workbook.add_worksheet("Sheet1")
 
-            # Test with style only
-            style = ExcelStyle(bold=True, italic=True, font_color="red", bg_color="blue")
-            format2 = workbook.get_combined_format(style, None)
+        # Verify add_worksheet was called
+        assert fake_xlsx[0].worksheet_names == ["Sheet1"]
 
-            # Verify add_format was called with correct properties
-            mock_workbook_instance.add_format.assert_called_with(
-                {"bold": True, "italic": True, "font_color": "red", "bg_color": "blue"}
-            )
+        # Verify the returned worksheet
+        assert worksheet is fake_xlsx[0].worksheets[0]
 
-            assert format2 is mock_format
+    def test_get_combined_format(self, fake_xlsx):
+        """Test the format caching mechanism."""
+        # Create the workbook
+        workbook = ExcelWorkbook("test.xlsx")
+
+        # Test with no style or format (should return None)
+        format1 = workbook.get_combined_format(None, None)
+        assert format1 is None
+
+        # Test with style only
+        style = ExcelStyle(bold=True, italic=True, font_color="red", bg_color="blue")
+        format2 = workbook.get_combined_format(style, None)
+        assert format2 is not None
+
+        # Test with num_format only
+        workbook.get_combined_format(None, "#,##0.00")
+
+        # Test with both style and num_format
+        workbook.get_combined_format(style, "#,##0.00")
+
+        # Verify add_format was called with the style, number format and combined properties
+        assert fake_xlsx[0].formats == [
+            {"bold": True, "italic": True, "font_color": "red", "bg_color": "blue"},
+            {"num_format": "#,##0.00"},
+            {"bold": True, "italic": True, "font_color": "red", "bg_color": "blue", "num_format": "#,##0.00"},
+        ]
+        # Adding the number format must not leak into the style's own properties
+        assert "num_format" not in style.to_props()
+
+    def test_format_caching(self, fake_xlsx):
+        """Test that formats are cached and reused."""
+        # Create the workbook
+        workbook = ExcelWorkbook("test.xlsx")
 
-            # Test with num_format only
-            workbook.get_combined_format(None, "#,##0.00")
+        # Get format with specific style and num_format
+        style = ExcelStyle(bold=True)
+        format1 = workbook.get_combined_format(style, "#,##0.00")
 
-            # Verify add_format was called with correct properties
-            mock_workbook_instance.add_format.assert_called_with({"num_format": "#,##0.00"})
+        # Verify add_format was called
+        assert len(fake_xlsx[0].formats) == 1
 
-            # Test with both style and num_format
-            workbook.get_combined_format(style, "#,##0.00")
+        # Get the same format again (should be cached)
+        format2 = workbook.get_combined_format(style, "#,##0.00")
 
-            # Verify add_format was called with combined properties
-            mock_workbook_instance.add_format.assert_called_with(
-                {"bold": True, "italic": True, "font_color": "red", "bg_color": "blue", "num_format": "#,##0.00"}
-            )
+        # Verify add_format was not called again
+        assert len(fake_xlsx[0].formats) == 1
 
-    def test_format_caching(self):
-        """Test that formats are cached and reused."""
-        with patch("xlsxwriter.Workbook") as mock_workbook:
-            # Configure the mock
-            mock_workbook_instance = MagicMock()
-            mock_format = MagicMock()
-            mock_workbook_instance.add_format.return_value = mock_format
-            mock_workbook.return_value = mock_workbook_instance
+        # Both format references should be the same
+        assert format1 is format2
 
-            # Create the workbook
-            workbook = ExcelWorkbook("test.xlsx")
+    def test_equal_styles_share_format(self, fake_xlsx):
+        """Test that distinct but equal (immutable) styles map to one cached format."""
+        workbook = ExcelWorkbook("test.xlsx")
+        style1 = ExcelStyle(bold=True, bg_color="blue")
+        style2 = ExcelStyle(bold=True, bg_color="blue")
+        assert hash(style1) == hash(style2)
 
-            # Get format with specific style and num_format
-            style = ExcelStyle(bold=True)
-            format1 = workbook.get_combined_format(style, "#,##0.00")
+        assert workbook.get_combined_format(style1, None) is workbook.get_combined_format(style2, None)
+        assert fake_xlsx[0].formats == [{"bold": True, "bg_color": "blue"}]
 
-            # Verify add_format was called
-            assert mock_workbook_instance.add_format.call_count == 1
+        # Styles cannot be changed after creation, so cached formats never go stale
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            style1.bold = False
 
-            # Get the same format again (should be cached)
-            format2 = workbook.get_combined_format(style, "#,##0.00")
+    def test_preregister_formats(self, fake_xlsx):
+        """Test priming the format cache before writing."""
+        workbook = ExcelWorkbook("test.xlsx")
+        style = ExcelStyle(bold=True)
 
-            # Verify add_format was not called again
-            assert mock_workbook_instance.add_format.call_count == 1
+        # Duplicate pairs should only create one format each
+        workbook.preregister_formats([(style, "0.00%"), (None, "#,##0"), (style, "0.00%"), (None, None)])
+        assert len(fake_xlsx[0].formats) == 2
 
-            # Both format references should be the same
-            assert format1 is format2
+        # Later lookups are served from the cache
+        workbook.get_combined_format(style, "0.00%")
+        assert len(fake_xlsx[0].formats) == 2
 
-    def test_close(self):
+    def test_close(self, fake_xlsx):
         """Test closing the workbook."""
-        with patch("xlsxwriter.Workbook") as mock_workbook:
-            # Configure the mock
-            mock_workbook_instance = MagicMock()
-            mock_workbook.return_value = mock_workbook_instance
-
-            # Create the workbook
-            workbook = ExcelWorkbook("test.xlsx")
+        # Create the workbook
+        workbook = ExcelWorkbook("test.xlsx")
 
-            # Close the workbook
-            workbook.close()
+        # Close the workbook
+        workbook.close()
 
-            # Verify close was called
-            mock_workbook_instance.close.assert_called_once()
+        # Verify close was called
+        assert fake_xlsx[0].close_calls == 1
 
-    def test_context_manager(self):
+    def test_context_manager(self, fake_xlsx):
         """Test using the workbook as a context manager."""
-        with patch("xlsxwriter.Workbook") as mock_workbook:
-            # Configure the mock
-            mock_workbook_instance = MagicMock()
-            mock_workbook.return_value = mock_workbook_instance
+        # Use as context manager
+        with ExcelWorkbook("test.xlsx") as workbook:
+            # Verify workbook was created
+            assert workbook.filename == "test.xlsx"
+
+        # Verify close was called on exit
+        assert fake_xlsx[0].close_calls == 1
+
+    def test_context_manager_preserves_original_exception(self, fake_xlsx):
+        """Test that a failing close() does not mask an exception raised in the with-block."""
+        workbook = ExcelWorkbook("test.xlsx")
 
-            # Use as context manager
-            with ExcelWorkbook("test.xlsx") as workbook:
-                # Verify workbook was created
-                assert workbook.filename == "test.xlsx"
+        # Make closing fail as well
+        workbook._workbook.close_error = OSError("disk full")
 
-            # Verify close was called on exit
-            mock_workbook_instance.close.assert_called_once()
+        with pytest.raises(RuntimeError, match="boom"), workbook:
+            raise RuntimeError("boom")
+
+        # Close was still attempted
+        assert fake_xlsx[0].close_calls == 1
 
 
 class TestExcelSheetLayout:
@@ -170,9 +207,8 @@ class TestExcelSheetLayout:
         # Create sheet layout
         sheet_layout = ExcelSheetLayout("Sheet1")
 
-        # Create a mock component
-        component = MagicMock()
-        component.get_size.return_value = (2, 3)  # 2 rows, 3 columns
+        # Create a stand-in component
+        component = StubComponent()
 
         # Add the component
         sheet_layout.add(component, row=1, col=2)
@@ -188,9 +224,8 @@ class TestExcelSheetLayout:
         # Create sheet layout
         sheet_layout = ExcelSheetLayout("Sheet1")
 
-        # Create a mock component
-        component = MagicMock()
-        component.get_size.return_value = (2, 3)  # 2 rows, 3 columns
+        # Create a stand-in component
+        component = StubComponent()
 
         # Add the component with specific position
         sheet_layout.add(component, 5, 3)
@@ -199,6 +234,15 @@ class TestExcelSheetLayout:
         assert sheet_layout._components[0].row == 5  # row
         assert sheet_layout._components[0].col == 3  # col
 
+    def test_add_many(self):
+        """Test adding several components in one call, with and without a direction."""
+        sheet_layout = ExcelSheetLayout("Sheet1")
+        first, second = StubComponent(), StubComponent()
+
+        sheet_layout.add_many([(first, 0, 0), (second, 4, 1, "right")])
+
+        assert sheet_layout.get_components() == [(first, 0, 0, "down"), (second, 4, 1, "right")]
+
     def test_render(self):
         """Test rendering the sheet layout."""
         # This test is obsolete as the render method now only exists in ExcelLayout
@@ -214,40 +258,36 @@ class TestExcelSheetLayout:
 class TestExcelLayout:
     """Tests for ExcelLayout class."""
 
+    @pytest.mark.usefixtures("fake_xlsx")
     def test_layout_creation(self):
         """Test creating an ExcelLayout."""
-        with patch("xlsxwriter.Workbook"):
-            # Create the workbook
-            workbook = ExcelWorkbook("test.xlsx")
+        # Create the workbook
+        workbook = ExcelWorkbook("test.xlsx")
 
-            # Create layout
-            layout = ExcelLayout(workbook)
+        # Create layout
+        layout = ExcelLayout(workbook)
 
-            # Verify initialization
-            assert layout.workbook is workbook
-            assert isinstance(layout._sheets, dict)
-            assert len(layout._sheets) == 0
+        # Verify initialization
+        assert layout.workbook is workbook
+        assert isinstance(layout._sheets, dict)
+        assert len(layout._sheets) == 0
 
+    @pytest.mark.usefixtures("fake_xlsx")
     def test_add_sheet(self):
         """Test adding a sheet to the layout."""
-        with patch("xlsxwriter.Workbook") as mock_workbook:
-            # Configure the mock
-            mock_workbook_instance = MagicMock()
-            mock_workbook.return_value = mock_workbook_instance
+        # Create the workbook
+        workbook = ExcelWorkbook("test.xlsx")
 
-            # Create the workbook
-            workbook = ExcelWorkbook("test.xlsx")
+        # Create layout
+        layout = ExcelLayout(workbook)
 
-            # Create layout
-            layout = ExcelLayout(workbook)
+        # Create a sheet
+        sheet = ExcelSheetLayout("Sheet1")
+        layout.add_sheet(sheet)
 
-            # Create a sheet
-            sheet = ExcelSheetLayout("Sheet1")
-            layout.add_sheet(sheet)
-
-            # Verify sheet was added
-            assert "Sheet1" in layout._sheets
-            assert layout._sheets["Sheet1"] is sheet
+        # Verify sheet was added
+        assert "Sheet1" in layout._sheets
+        assert layout._sheets["Sheet1"] is sheet
 
     def test_set_current_sheet(self):
         """Test setting the current sheet - this method no longer exists."""
@@ -259,130 +299,217 @@ class TestExcelLayout:
         This functionality now requires creating a sheet layout first, then adding components to it."""
         pass
 
-    def test_render(self):
+    def test_render(self, fake_xlsx):
         """Test rendering the layout - now called 'write'."""
-        with patch("xlsxwriter.Workbook") as mock_workbook:
-            # Configure the mock
-            mock_workbook_instance = MagicMock()
-            mock_worksheet = MagicMock()
-            mock_workbook_instance.add_worksheet.return_value = mock_worksheet
-            mock_workbook.return_value = mock_workbook_instance
+        # Create the workbook
+        workbook = ExcelWorkbook("test.xlsx")
 
-            # Create the workbook
-            workbook = ExcelWorkbook("test.xlsx")
+        # Create layout and multiple sheets
+        layout = ExcelLayout(workbook)
 
-            # Create layout and multiple sheets
-            layout = ExcelLayout(workbook)
+        # Create sheet layouts
+        sheet1 = ExcelSheetLayout("Sheet1")
+        sheet2 = ExcelSheetLayout("Sheet2")
 
-            # Create sheet layouts
-            sheet1 = ExcelSheetLayout("Sheet1")
-            sheet2 = ExcelSheetLayout("Sheet2")
+        # Add sheets to layout (both are left empty)
+        layout.add_sheet(sheet1)
+        layout.add_sheet(sheet2)
 
-            # Mock the get_components method
-            sheet1.get_components = MagicMock(return_value=[])
-            sheet2.get_components = MagicMock(return_value=[])
+        # Call write (formerly render)
+        layout.write()
 
-            # Add sheets to layout
-            layout.add_sheet(sheet1)
-            layout.add_sheet(sheet2)
+        # Verify add_worksheet was called for each sheet
+        assert fake_xlsx[0].worksheet_names == ["Sheet1", "Sheet2"]
 
-            # Mock the close method to avoid actual file operations
-            workbook.close = MagicMock()
+        # Verify the workbook was closed
+        assert fake_xlsx[0].close_calls == 1
 
-            # Call write (formerly render)
-            layout.write()
+    @pytest.mark.usefixtures("fake_xlsx")
+    def test_assign_references_recursive(self):
+        """Test _assign_references_recursive method."""
+        # Create the workbook
+        workbook = ExcelWorkbook("test.xlsx")
 
-            # Verify add_worksheet was called for each sheet
-            mock_workbook_instance.add_worksheet.assert_any_call("Sheet1")
-            mock_workbook_instance.add_worksheet.assert_any_call("Sheet2")
-            assert mock_workbook_instance.add_worksheet.call_count == 2
+        # Create layout
+        layout = ExcelLayout(workbook)
 
-            # Verify workbook.close was called
-            workbook.close.assert_called_once()
+        # Create a value to assign references
+        value = ExcelValue(42)
 
-    def test_assign_references_recursive(self):
-        """Test _assign_references_recursive method."""
-        with patch("xlsxwriter.Workbook"):
-            # Create the workbook
-            workbook = ExcelWorkbook("test.xlsx")
+        # Create a reference map
+        ref_map = {}
+
+        # Assign references
+        layout._assign_references_recursive(value, 2, 3, "Sheet1", ref_map)
+
+        # Verify reference was assigned and added to map
+        assert value._excel_ref == "D3"  # (2, 3) -> D3
+        assert ref_map[value.id] == ("Sheet1", "D3")
+
+    @pytest.mark.usefixtures("fake_xlsx")
+    def test_assign_references_recursive_subclass(self):
+        """Test subclasses not in the dispatch table still resolve to their base handler."""
+
+        class TaggedValue(ExcelValue):
+            pass
+
+        layout = ExcelLayout(ExcelWorkbook("test.xlsx"))
+        value = TaggedValue(42)
+        ref_map = {}
+
+        layout._assign_references_recursive(value, 0, 0, "Sheet1", ref_map)
+
+        assert ref_map[value.id] == ("Sheet1", "A1")
+
+    def test_assign_references_recursive_unhandled_type(self, caplog):
+        """Test unhandled component types are reported and not added to the dispatch table."""
+
+        class Unhandled:
+            pass
+
+        layout = ExcelLayout(None)
+
+        layout._assign_references_recursive(Unhandled(), 0, 0, "Sheet1", {})
+
+        assert "unhandled component type" in caplog.text
+        assert Unhandled not in _REF_HANDLERS
+
+    @pytest.mark.usefixtures("fake_xlsx")
+    def test_assign_references_recursive_table_without_child_method(self, caplog):
+        """Test a table whose _assign_child_references is not callable is reported, not called."""
+        layout = ExcelLayout(ExcelWorkbook("test.xlsx"))
+        table = ExcelTable(title="Broken")
+        table._assign_child_references = None
+
+        layout._assign_references_recursive(table, 0, 0, "Sheet1", {})
+
+        assert "missing _assign_child_references" in caplog.text
+
+    @pytest.mark.usefixtures("fake_xlsx")
+    def test_assign_references_batch(self):
+        """Test _assign_references_batch assigns a downward run of cells in one call."""
+        layout = ExcelLayout(ExcelWorkbook("test.xlsx"))
+
+        # A literal, a formula referencing an unplaced value, and an already mapped value
+        literal = ExcelValue(1)
+        unplaced = ExcelValue(2)
+        formula_value = literal + unplaced
+        mapped = ExcelValue(3)
+        ref_map = {mapped.id: ("Other", "Z9")}
+
+        layout._assign_references_batch([literal, formula_value, mapped], 2, 27, "Sheet1", ref_map)
+
+        # (2, 27) -> AB3, then one row down per value
+        assert literal._excel_ref == "AB3"
+        assert ref_map[literal.id] == ("Sheet1", "AB3")
+        assert ref_map[formula_value.id] == ("Sheet1", "AB4")
+        # Unmapped formula arguments are still assigned via the recursive helper
+        assert unplaced.id in ref_map
+        # Already mapped values keep their reference
+        assert ref_map[mapped.id] == ("Other", "Z9")
+
+    def test_row_ordered_worksheet_partial_flush(self, spy_factory):
+        """Test flush(before_row) replays finished rows in order and keeps later rows buffered."""
+        spy = spy_factory(name="Sheet1")
+        worksheet = _RowOrderedWorksheet(spy)
+        # Column by column, as a table writes
+        for col in range(2):
+            for row in range(3):
+                worksheet.write_number(row, col, row * 10 + col)
+
+        worksheet.flush(before_row=2)
+        assert [args[:2] for _, args, _ in spy.calls] == [(0, 0), (0, 1), (1, 0), (1, 1)]
 
-            # Create layout
-            layout = ExcelLayout(workbook)
+        worksheet.flush()
+        assert [args[:2] for _, args, _ in spy.calls[4:]] == [(2, 0), (2, 1)]
 
-            # Create a value to assign references
-            value = ExcelValue(42)
+    def test_column_width_runs(self):
+        """Test adjacent columns with equal widths are folded into one set_column range."""
+        # Three equal widths collapse into a single run
+        assert _column_width_runs({2: 10, 0: 10, 1: 10}) == [(0, 2, 10)]
+        # A different width or a gap starts a new run
+        assert _column_width_runs({0: 10, 1: 12, 2: 12, 4: 12}) == [(0, 0, 10), (1, 2, 12), (4, 4, 12)]
+        assert _column_width_runs({}) == []
 
-            # Create a reference map
-            ref_map = {}
+    def test_render_sheet(self):
+        """Test render_sheet returns the values and formulas a sheet would write, keyed by A1 address."""
+        sheet = ExcelSheetLayout("Sheet1")
+        quantity = ExcelValue(3, name="Quantity")
+        price = ExcelValue(2.5, name="Price")
+        sheet.add(quantity, 0, 0)
+        sheet.add(price, 1, 0)
+        sheet.add(quantity * price, 2, 0)
 
-            # Assign references
-            layout._assign_references_recursive(value, 2, 3, "Sheet1", ref_map)
+        cells = render_sheet(sheet)
 
-            # Verify reference was assigned and added to map
-            assert value._excel_ref == "D3"  # (2, 3) -> D3
-            assert ref_map[value.id] == ("Sheet1", "D3")
+        assert cells == {"A1": 3, "A2": 2.5, "A3": "=A1*A2"}
 
 
 class TestIntegration:
     """Integration tests for working with layout, workbook, and components together."""
 
-    def test_basic_workflow(self):
+    @pytest.mark.integration
+    @pytest.mark.parametrize("constant_memory", [False, True])
+    def test_basic_workflow(self, constant_memory, tmp_path):
         """Test a basic workflow of creating and rendering a workbook with components."""
-        # Create a temporary file for testing
-        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as temp_file:
-            temp_filename = temp_file.name
+        # Write into memory; writing to disk is covered by the example tests
+        output = io.BytesIO()
 
-        try:
-            # Create an actual workbook (not mocked) for integration testing
-            workbook = ExcelWorkbook(temp_filename)
+        # Create an actual workbook (not mocked) for integration testing; constant_memory
+        # spills rows to temporary files, kept in this test's own directory. Otherwise the
+        # workbook is built in_memory, so no temporary files are written at all
+        workbook = ExcelWorkbook(output, constant_memory=constant_memory, in_memory=not constant_memory, tmpdir=str(tmp_path))
 
-            # Create layout
-            layout = ExcelLayout(workbook)
+        # Create layout
+        layout = ExcelLayout(workbook)
 
-            # Create sheets
-            parameters_sheet = ExcelSheetLayout("Parameters")
-            calculations_sheet = ExcelSheetLayout("Calculations")
+        # Create sheets
+        parameters_sheet = ExcelSheetLayout("Parameters")
+        calculations_sheet = ExcelSheetLayout("Calculations")
 
-            # Add sheets to layout
-            layout.add_sheet(parameters_sheet)
-            layout.add_sheet(calculations_sheet)
+        # Add sheets to layout
+        layout.add_sheet(parameters_sheet)
+        layout.add_sheet(calculations_sheet)
 
-            # Create components
-            # Parameter table
-            param1 = ExcelValue(100, name="Quantity", unit="pcs")
-            param2 = ExcelValue(25.5, name="Unit Price", unit="$")
-            param_table = ExcelParameterTable(title="Input Parameters", parameters=[param1, param2])
+        # Create components
+        # Parameter table
+        param1 = ExcelValue(100, name="Quantity", unit="pcs")
+        param2 = ExcelValue(25.5, name="Unit Price", unit="$")
+        param_table = ExcelParameterTable(title="Input Parameters", parameters=[param1, param2])
 
-            # Add parameter table to Parameters sheet
-            parameters_sheet.add(param_table, row=1, col=1)
+        # Add parameter table to Parameters sheet
+        parameters_sheet.add(param_table, row=1, col=1)
 
-            # Create a calculation
-            total = param1 * param2
-            total.name = "Total Price"
+        # Create a calculation
+        total = param1 * param2
+        total.name = "Total Price"
 
-            # Create a series
-            quantities = ExcelSeries(name="Quantities", data=[10, 20, 30, 40, 50])
+        # Create a series
+        quantities = ExcelSeries(name="Quantities", data=[10, 20, 30, 40, 50])
 
-            prices = ExcelSeries(name="Prices", data=[1.5, 2.5, 3.5, 4.5, 5.5])
+        prices = ExcelSeries(name="Prices", data=[1.5, 2.5, 3.5, 4.5, 5.5])
 
-            totals = quantities * prices
-            totals.name = "Totals"
+        totals = quantities * prices
+        totals.name = "Totals"
 
-            # Create a table with the series
-            table = ExcelTable(title="Calculation Table", columns=[quantities, prices, totals])
+        # Create a table with the series
+        table = ExcelTable(title="Calculation Table", columns=[quantities, prices, totals])
 
-            # Add components to Calculations sheet
-            calculations_sheet.add(ExcelValue(total, name="Total"), row=1, col=1)
-            calculations_sheet.add(table, row=3, col=1)
+        # Add components to Calculations sheet
+        calculations_sheet.add(ExcelValue(total, name="Total"), row=1, col=1)
+        calculations_sheet.add(table, row=3, col=1)
 
-            # Write the layout
-            layout.write()
+        # Write the layout
+        layout.write()
 
-            # Verify file was created and has non-zero size
-            assert os.path.exists(temp_filename)
-            assert os.path.getsize(temp_filename) > 0
+        # Verify a valid .xlsx archive with both worksheets was produced
+        with zipfile.ZipFile(io.BytesIO(output.getvalue())) as archive:
+            names = archive.namelist()
+            calculations_xml = archive.read("xl/worksheets/sheet2.xml").decode("utf-8")
+        assert "xl/worksheets/sheet1.xml" in names
+        assert "xl/worksheets/sheet2.xml" in names
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_filename):
-                os.unlink(temp_filename)
+        # Every table column kept its cells, including in constant_memory mode where
+        # rows are flushed as soon as a later row is written
+        for cell_ref in ("B6", "C6", "D6", "B10", "D10"):
+            assert f'<c r="{cell_ref}"' in calculations_xml